@@ -0,0 +1,195 @@
+from collections.abc import Awaitable
+from typing import Any, cast
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils.decorators import classonlymethod
+from django.utils.functional import cached_property
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from .models import BankAccount, User
+
+# Added to every token by AccountTokenObtainPairSerializer
+ACCOUNT_CLAIMS = ("email", "account_id", "account_number")
+
+
+class AccountTokenUser(TokenUser):
+    # Built from the token claims alone; views needing the User model load it
+    @cached_property
+    def id(self) -> str:
+        return str(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def email(self) -> str:
+        return self.token["email"]
+
+    @cached_property
+    def account_id(self) -> int:
+        return int(self.token["account_id"])
+
+    @cached_property
+    def account_number(self) -> str:
+        return self.token["account_number"]
+
+    def __str__(self) -> str:
+        return self.email
+
+
+class AccountJWTAuthentication(JWTAuthentication):
+    # Replaces the per-request User and bank account queries with token claims.
+    # Only the active flag is looked up, and cached for JWT_ACTIVE_CHECK_TTL.
+
+    def get_user(self, validated_token: Token) -> AccountTokenUser:  # type: ignore[override]
+        user_id = self._get_user_id(validated_token)
+
+        if self._has_account_claims(validated_token):
+            is_active = cache.get(self._active_key(user_id))
+            if is_active is None:
+                is_active = User.objects.filter(pk=user_id, is_active=True).exists()
+                cache.set(
+                    self._active_key(user_id), is_active, settings.JWT_ACTIVE_CHECK_TTL
+                )
+        else:
+            row = self._legacy_claims_query(user_id).first()
+            is_active = self._add_legacy_claims(validated_token, row)
+
+        return self._token_user(validated_token, is_active)
+
+    async def aauthenticate(
+        self, request: HttpRequest
+    ) -> tuple[AccountTokenUser, Token] | None:
+        header = self.get_header(request)  # type: ignore[arg-type]
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token: Token) -> AccountTokenUser:
+        user_id = self._get_user_id(validated_token)
+
+        if self._has_account_claims(validated_token):
+            is_active = await cache.aget(self._active_key(user_id))
+            if is_active is None:
+                is_active = await User.objects.filter(
+                    pk=user_id, is_active=True
+                ).aexists()
+                await cache.aset(
+                    self._active_key(user_id),
+                    is_active,
+                    settings.JWT_ACTIVE_CHECK_TTL,
+                )
+        else:
+            row = await self._legacy_claims_query(user_id).afirst()
+            is_active = self._add_legacy_claims(validated_token, row)
+
+        return self._token_user(validated_token, is_active)
+
+    @staticmethod
+    def _get_user_id(validated_token: Token) -> int:
+        try:
+            return int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            ) from e
+
+    @staticmethod
+    def _has_account_claims(validated_token: Token) -> bool:
+        return all(claim in validated_token for claim in ACCOUNT_CLAIMS)
+
+    @staticmethod
+    def _active_key(user_id: int) -> str:
+        return f"auth:user:{user_id}:active"
+
+    @staticmethod
+    def _legacy_claims_query(user_id: int) -> Any:
+        # Tokens issued before the account claims existed: one joined lookup
+        return BankAccount.objects.filter(user_id=user_id).values_list(
+            "user__email", "pk", "account_number", "user__is_active"
+        )
+
+    @staticmethod
+    def _add_legacy_claims(
+        validated_token: Token, row: tuple[str, int, str, bool] | None
+    ) -> bool:
+        if row is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        email, account_id, account_number, is_active = row
+        validated_token["email"] = email
+        validated_token["account_id"] = account_id
+        validated_token["account_number"] = account_number
+        return is_active
+
+    @staticmethod
+    def _token_user(validated_token: Token, is_active: bool) -> AccountTokenUser:
+        if not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return AccountTokenUser(validated_token)
+
+
+def api_error_response(exc: APIException) -> JsonResponse:
+    # Same body shape as DRF's default exception handler
+    if isinstance(exc.detail, dict | list):
+        data: Any = exc.detail
+    else:
+        data = {"detail": exc.detail}
+    return JsonResponse(data, status=exc.status_code, safe=False)
+
+
+class AsyncAPIView(View):
+    # Plain Django async view with JWT authentication for hot read paths.
+    # DRF's APIView is synchronous, so under ASGI it pins a worker thread
+    # for the whole request.
+    authentication = AccountJWTAuthentication()
+
+    @classonlymethod
+    def as_view(cls, **initkwargs: Any) -> Any:
+        # Token authenticated like the DRF views, so no CSRF cookie is involved
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(  # type: ignore[override]
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        try:
+            credentials = await self.authentication.aauthenticate(request)
+        except APIException as e:
+            return self._unauthorized(request, api_error_response(e))
+
+        if credentials is None:
+            return self._unauthorized(
+                request,
+                JsonResponse(
+                    {"detail": "Authentication credentials were not provided."},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                ),
+            )
+
+        request.user, request.auth = credentials  # type: ignore[assignment,attr-defined]
+        # View.dispatch hands back the coroutine of the async handler
+        return await cast(
+            Awaitable[HttpResponse], super().dispatch(request, *args, **kwargs)
+        )
+
+    def _unauthorized(
+        self, request: HttpRequest, response: JsonResponse
+    ) -> JsonResponse:
+        response["WWW-Authenticate"] = self.authentication.authenticate_header(
+            request  # type: ignore[arg-type]
+        )
+        return response
@@ -0,0 +1,117 @@
+import uuid
+from collections.abc import Iterable
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .models import BankAccount
+
+
+class BalanceCache:
+    # Every cached balance is tagged with the account's current generation.
+    # Writers replace the generation after commit instead of writing balances,
+    # so an entry filled from a read that raced with a transfer can never match
+    # and a committed transfer is always visible on the next read.
+
+    @staticmethod
+    def enabled() -> bool:
+        # A per-process cache only sees the generation bumps of transfers its
+        # own worker handled, the others would serve stale balances
+        return settings.WEB_CONCURRENCY <= 1 or not isinstance(
+            caches[DEFAULT_CACHE_ALIAS], LocMemCache
+        )
+
+    @staticmethod
+    def _entry_key(account_pk: int) -> str:
+        return f"balance:{account_pk}"
+
+    @staticmethod
+    def _generation_key(account_pk: int) -> str:
+        return f"balance:{account_pk}:generation"
+
+    @staticmethod
+    def get(account_pk: int) -> tuple[str, Decimal]:
+        if not BalanceCache.enabled():
+            return BankAccount.objects.values_list("account_number", "balance").get(
+                pk=account_pk
+            )
+
+        entry_key = BalanceCache._entry_key(account_pk)
+        generation_key = BalanceCache._generation_key(account_pk)
+
+        found = cache.get_many([entry_key, generation_key])
+        generation = found.get(generation_key)
+        entry = found.get(entry_key)
+
+        if entry is not None and generation is not None and entry[0] == generation:
+            return entry[1], entry[2]
+
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not cache.add(generation_key, generation, timeout=None):
+                generation = cache.get(generation_key)
+
+        account_number, balance = BankAccount.objects.values_list(
+            "account_number", "balance"
+        ).get(pk=account_pk)
+
+        cache.set(
+            entry_key,
+            (generation, account_number, balance),
+            timeout=settings.BALANCE_CACHE_TIMEOUT,
+        )
+        return account_number, balance
+
+    @staticmethod
+    async def aget(account_pk: int) -> tuple[str, Decimal]:
+        if not BalanceCache.enabled():
+            return await BankAccount.objects.values_list(
+                "account_number", "balance"
+            ).aget(pk=account_pk)
+
+        entry_key = BalanceCache._entry_key(account_pk)
+        generation_key = BalanceCache._generation_key(account_pk)
+
+        found = await cache.aget_many([entry_key, generation_key])
+        generation = found.get(generation_key)
+        entry = found.get(entry_key)
+
+        if entry is not None and generation is not None and entry[0] == generation:
+            return entry[1], entry[2]
+
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not await cache.aadd(generation_key, generation, timeout=None):
+                generation = await cache.aget(generation_key)
+
+        account_number, balance = await BankAccount.objects.values_list(
+            "account_number", "balance"
+        ).aget(pk=account_pk)
+
+        await cache.aset(
+            entry_key,
+            (generation, account_number, balance),
+            timeout=settings.BALANCE_CACHE_TIMEOUT,
+        )
+        return account_number, balance
+
+    @staticmethod
+    def invalidate(account_pks: Iterable[int]) -> None:
+        if not BalanceCache.enabled():
+            return
+
+        generation_keys = [BalanceCache._generation_key(pk) for pk in account_pks]
+
+        def bump_generations() -> None:
+            cache.set_many(
+                {key: uuid.uuid4().hex for key in generation_keys}, timeout=None
+            )
+
+        # Bumping now stops readers reusing entries while the write is in flight;
+        # bumping again after commit discards anything they cached from the
+        # pre-commit snapshot in the meantime
+        bump_generations()
+        transaction.on_commit(bump_generations)
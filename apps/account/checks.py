@@ -0,0 +1,44 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.checks import CheckMessage, Tags, Warning, register
+from django.db import DatabaseError
+
+from .cache import BalanceCache
+from .models import BankAccount
+
+
+@register(Tags.caches)
+def check_balance_cache(app_configs: Any = None, **kwargs: Any) -> list[CheckMessage]:
+    if BalanceCache.enabled():
+        return []
+
+    return [
+        Warning(
+            f"The default cache is per process and WEB_CONCURRENCY is "
+            f"{settings.WEB_CONCURRENCY}, balances are read from the database "
+            "on every request",
+            hint="Configure a shared CACHE_BACKEND, e.g. RedisCache.",
+            id="account.W002",
+        )
+    ]
+
+
+@register(Tags.database)
+def check_system_account(
+    app_configs: Any = None, databases: Any = None, **kwargs: Any
+) -> list[CheckMessage]:
+    if not databases or "default" not in databases:
+        return []
+
+    BankAccount.clear_system_account_ref()
+    try:
+        # Warms the process-wide cache used by the transfer path
+        BankAccount.get_system_account_ref()
+    except DatabaseError:
+        # Tables are not created yet, `migrate` will take care of it
+        return []
+    except ValueError as e:
+        return [Warning(str(e), id="account.W001")]
+
+    return []
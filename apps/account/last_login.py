@@ -0,0 +1,102 @@
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    # last_login is informational, so logins only record the timestamp in
+    # memory and a background thread writes all pending ones with a single
+    # UPDATE every LAST_LOGIN_FLUSH_INTERVAL seconds. Pending timestamps are
+    # flushed at interpreter exit.
+
+    def __init__(self) -> None:
+        self._pending: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        atexit.register(self.stop)
+
+    def record(self, email: str, logged_in_at: datetime | None = None) -> None:
+        logged_in_at = logged_in_at or timezone.now()
+
+        if settings.LAST_LOGIN_FLUSH_INTERVAL <= 0:
+            self._write({email: logged_in_at})
+            return
+
+        with self._lock:
+            self._pending[email] = max(
+                logged_in_at, self._pending.get(email, logged_in_at)
+            )
+            if self._thread is None:
+                self._start()
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        try:
+            self._write(pending)
+        except Exception:
+            logger.exception(f"Failed to flush {len(pending)} last_login updates")
+            with self._lock:
+                for email, logged_in_at in pending.items():
+                    self._pending[email] = max(
+                        logged_in_at, self._pending.get(email, logged_in_at)
+                    )
+            return 0
+
+        logger.debug(f"Flushed {len(pending)} last_login updates")
+        return len(pending)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="last-login-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(settings.LAST_LOGIN_FLUSH_INTERVAL):
+            self.flush()
+            # Hand the connection back (or to the pool) between flushes
+            close_old_connections()
+
+    @staticmethod
+    def _write(pending: dict[str, datetime]) -> None:
+        table = connection.ops.quote_name(User._meta.db_table)
+        values = ", ".join(["(%s, %s::timestamptz)"] * len(pending))
+        params = [value for item in pending.items() for value in item]
+
+        # GREATEST ignores NULL, and keeps a newer timestamp written elsewhere
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table} AS u
+                SET last_login = GREATEST(u.last_login, login.logged_in_at)
+                FROM (VALUES {values}) AS login(email, logged_in_at)
+                WHERE u.email = login.email
+                """,
+                params,
+            )
+
+
+last_login_buffer = LastLoginBuffer()
@@ -0,0 +1,134 @@
+import csv
+import os
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, TextIO
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.validators import validate_email
+from django.db import IntegrityError
+
+from apps.account.models import User
+from apps.account.services import AccountService
+
+
+def _hash_password(password: str) -> str:
+    # An empty password gives an unusable one, as create_user(password=None) does
+    return make_password(password or None)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV file with 'email' and 'password' columns, "
+        "creating their accounts and welcome bonuses in bulk"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="CSV file to import, '-' reads stdin")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Users hashed and inserted per batch",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes hashing passwords",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size = options["batch_size"]
+        if batch_size <= 0 or options["workers"] <= 0:
+            raise CommandError("--batch-size and --workers must be positive")
+
+        self.started = time.perf_counter()
+        self.imported = self.skipped = 0
+
+        with (
+            self._open(options["path"]) as source,
+            ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=django.setup
+            ) as pool,
+        ):
+            rows = self._rows(source)
+            while batch := list(islice(rows, batch_size)):
+                self._import_batch(batch, pool, options["workers"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {self.imported} users, skipped {self.skipped} "
+                f"in {time.perf_counter() - self.started:.1f}s"
+            )
+        )
+
+    def _open(self, path: str) -> TextIO:
+        if path == "-":
+            return os.fdopen(os.dup(sys.stdin.fileno()), newline="")
+        try:
+            return open(path, newline="")
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e}") from e
+
+    def _rows(self, source: TextIO) -> Iterator[tuple[str, str]]:
+        reader = csv.DictReader(source)
+        if not reader.fieldnames or "email" not in reader.fieldnames:
+            raise CommandError("CSV must have an 'email' column")
+
+        for line, row in enumerate(reader, start=2):
+            email = User.objects.normalize_email((row["email"] or "").strip())
+            try:
+                validate_email(email)
+            except ValidationError:
+                self.stderr.write(f"Line {line}: invalid email {email!r}, skipped")
+                self.skipped += 1
+                continue
+            yield email, row.get("password") or ""
+
+    def _import_batch(
+        self,
+        batch: list[tuple[str, str]],
+        pool: ProcessPoolExecutor,
+        workers: int,
+    ) -> None:
+        unique = dict(batch)  # last row wins for emails repeated in the batch
+        self.skipped += len(batch) - len(unique)
+
+        # Users that already exist are dropped before any password is hashed
+        existing = self._existing(unique)
+        emails = [email for email in unique if email not in existing]
+        self.skipped += len(existing)
+
+        hashes = pool.map(
+            _hash_password,
+            [unique[email] for email in emails],
+            chunksize=max(1, len(emails) // (workers * 4)),
+        )
+        credentials = list(zip(emails, hashes, strict=True))
+
+        try:
+            AccountService.bulk_create_users_with_accounts(credentials)
+        except IntegrityError:
+            # Someone signed up with one of these emails in the meantime
+            existing = self._existing(unique)
+            self.skipped += len(existing) - (len(unique) - len(emails))
+            credentials = [c for c in credentials if c[0] not in existing]
+            AccountService.bulk_create_users_with_accounts(credentials)
+
+        self.imported += len(credentials)
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            f"Imported {self.imported} users ({self.imported / elapsed:.0f} rows/s)"
+        )
+
+    def _existing(self, emails: dict[str, str]) -> set[str]:
+        return set(
+            User.objects.filter(email__in=list(emails)).values_list("email", flat=True)
+        )
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:17
+
+from django.db import migrations, models
+
+# 387420489 (3^18) is coprime with 10^9, so multiplying the sequence value by it
+# modulo 10^9 is a bijection: every body is issued at most once, but consecutive
+# accounts do not get guessable consecutive numbers. The tenth digit is a Luhn
+# check digit. Numbers issued by the old random generator are skipped.
+CREATE_ALLOCATOR = """
+CREATE SEQUENCE IF NOT EXISTS bank_account_number_seq MAXVALUE 999999999 NO CYCLE;
+
+CREATE OR REPLACE FUNCTION next_account_number() RETURNS varchar(10)
+LANGUAGE plpgsql VOLATILE AS $$
+DECLARE
+    body text;
+    total integer;
+    digit integer;
+    candidate varchar(10);
+BEGIN
+    LOOP
+        body := lpad(
+            ((nextval('bank_account_number_seq') * 387420489) % 1000000000)::text,
+            9,
+            '0'
+        );
+
+        total := 0;
+        FOR idx IN 1..9 LOOP
+            digit := substr(body, 10 - idx, 1)::integer;
+            IF idx % 2 = 1 THEN
+                digit := digit * 2;
+                IF digit > 9 THEN
+                    digit := digit - 9;
+                END IF;
+            END IF;
+            total := total + digit;
+        END LOOP;
+
+        candidate := body || ((10 - total % 10) % 10)::text;
+
+        IF NOT EXISTS (
+            SELECT 1 FROM bank_accounts WHERE account_number = candidate
+        ) THEN
+            RETURN candidate;
+        END IF;
+    END LOOP;
+END;
+$$;
+"""
+
+DROP_ALLOCATOR = """
+DROP FUNCTION IF EXISTS next_account_number();
+DROP SEQUENCE IF EXISTS bank_account_number_seq;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0003_create_system_account"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_ALLOCATOR, reverse_sql=DROP_ALLOCATOR),
+        migrations.AlterField(
+            model_name="bankaccount",
+            name="account_number",
+            field=models.CharField(
+                db_default=models.Func(
+                    function="next_account_number", output_field=models.CharField()
+                ),
+                editable=False,
+                max_length=10,
+                unique=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0004_account_number_sequence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bankaccount",
+            name="version",
+            field=models.PositiveBigIntegerField(db_default=0),
+        ),
+    ]
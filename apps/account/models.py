@@ -1,9 +1,15 @@
-import random
-from typing import Any, ClassVar
+from typing import Any, ClassVar, NamedTuple
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 
+SYSTEM_USER_EMAIL = "system@simplebank.internal"
+
+
+class SystemAccountRef(NamedTuple):
+    pk: int
+    account_number: str
+
 
 class UserManager(BaseUserManager[Any]):
     def create_user(
@@ -36,33 +42,54 @@ class BankAccount(models.Model):
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, related_name="bank_account"
     )
-    account_number = models.CharField(max_length=10, unique=True, editable=False)
+    # Allocated by Postgres (see migration 0004): a sequence value scrambled
+    # into 9 digits plus a Luhn check digit, returned by the INSERT itself
+    account_number = models.CharField(
+        max_length=10,
+        unique=True,
+        editable=False,
+        db_default=models.Func(
+            function="next_account_number", output_field=models.CharField()
+        ),
+    )
     balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Bumped by every balance change, optimistic transfers debit the sender
+    # only if it is unchanged since they read the account
+    version = models.PositiveBigIntegerField(db_default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # The system account never changes, so its identity is cached per process
+    _system_account_ref: ClassVar[SystemAccountRef | None] = None
+
     class Meta:
         db_table = "bank_accounts"
 
     def __str__(self) -> str:
         return f"{self.account_number} - {self.user.email}"
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        if not self.account_number:
-            self.account_number = self._generate_account_number()
-        super().save(*args, **kwargs)
-
-    @staticmethod
-    def _generate_account_number() -> str:
-        while True:
-            number = "".join([str(random.randint(0, 9)) for _ in range(10)])
-            if not BankAccount.objects.filter(account_number=number).exists():
-                return number
+    @classmethod
+    def get_system_account_ref(cls) -> SystemAccountRef:
+        if cls._system_account_ref is None:
+            row = (
+                cls.objects.filter(user__email=SYSTEM_USER_EMAIL)
+                .values_list("pk", "account_number")
+                .first()
+            )
+            if row is None:
+                raise ValueError("System account not found. Run migrations")
+            cls._system_account_ref = SystemAccountRef(*row)
+        return cls._system_account_ref
+
+    @classmethod
+    def clear_system_account_ref(cls) -> None:
+        cls._system_account_ref = None
 
     @staticmethod
     def get_system_account() -> "BankAccount":
+        system_ref = BankAccount.get_system_account_ref()
         try:
-            system_user = User.objects.get(email="system@simplebank.internal")
-            return system_user.bank_account
-        except User.DoesNotExist:
+            return BankAccount.objects.get(pk=system_ref.pk)
+        except BankAccount.DoesNotExist:
+            BankAccount.clear_system_account_ref()
             raise ValueError("System account not found. Run migrations") from None
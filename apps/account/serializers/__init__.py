@@ -1,5 +1,6 @@
 from .balance_serializers import BalanceSerializer
 from .user_serializers import (
+    AccountTokenObtainPairSerializer,
     BankAccountSerializer,
     UserRegistrationResponseSerializer,
     UserRegistrationSerializer,
@@ -12,4 +13,5 @@ __all__ = [
     "UserSerializer",
     "BankAccountSerializer",
     "UserRegistrationSerializer",
+    "AccountTokenObtainPairSerializer",
 ]
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import AuthUser, TokenObtainPairSerializer
+from rest_framework_simplejwt.tokens import Token
 
 from ..models import BankAccount, User
 from ..services import AccountService
@@ -37,3 +39,22 @@ class BankAccountSerializer(serializers.ModelSerializer):
 class UserRegistrationResponseSerializer(serializers.Serializer):
     user = UserSerializer()
     account = BankAccountSerializer()
+
+
+class AccountTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # Claims read by AccountJWTAuthentication instead of querying per request
+    @classmethod
+    def get_token(cls, user: AuthUser) -> Token:
+        token = super().get_token(user)
+        if not isinstance(user, User):
+            return token
+        token["email"] = user.email
+
+        try:
+            account = user.bank_account
+        except BankAccount.DoesNotExist:
+            return token
+
+        token["account_id"] = account.pk
+        token["account_number"] = account.account_number
+        return token
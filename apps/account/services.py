@@ -3,11 +3,15 @@ from decimal import Decimal
 from typing import Any
 
 from django.db import transaction
-from django.db.models import F
 from django.utils import timezone
 
+from apps.outbox.models import OutboxEvent
+from apps.outbox.services import OutboxService
 from apps.transaction.models import Transaction
+from apps.transaction.services import DailyBalanceService
 
+from .cache import BalanceCache
+from .last_login import last_login_buffer
 from .models import BankAccount, User
 
 logger = logging.getLogger(__name__)
@@ -20,20 +24,21 @@ class AccountService:
     @transaction.atomic
     def create_user_with_account(email: str, password: str) -> dict[str, Any]:
         user = User.objects.create_user(email=email, password=password)
-        bank_account = BankAccount.objects.create(user=user)
-
-        BankAccount.objects.filter(pk=bank_account.pk).update(
-            balance=F("balance") + AccountService.WELCOME_BONUS
+        bank_account = BankAccount.objects.create(
+            user=user, balance=AccountService.WELCOME_BONUS
         )
 
-        Transaction.objects.create(
+        bonus = Transaction.objects.create(
             account=bank_account,
             amount=AccountService.WELCOME_BONUS,
             transaction_type=Transaction.BONUS,
             description="Welcome bonus",
+            balance_after=AccountService.WELCOME_BONUS,
         )
+        DailyBalanceService.record([bonus])
+        OutboxService.record([AccountService._account_created_event(bank_account)])
 
-        bank_account.refresh_from_db()
+        BalanceCache.invalidate([bank_account.pk])
 
         logger.info(
             f"User created with bonus: {email}, "
@@ -45,6 +50,60 @@ class AccountService:
             "account": bank_account,
         }
 
+    @staticmethod
+    @transaction.atomic
+    def bulk_create_users_with_accounts(
+        credentials: list[tuple[str, str]],
+    ) -> list[BankAccount]:
+        # `credentials` are (normalized email, password hash) pairs; hashing is
+        # left to the caller so it can be spread over several processes
+        now = timezone.now()
+        users = User.objects.bulk_create(
+            [
+                User(email=email, password=password_hash, date_joined=now)
+                for email, password_hash in credentials
+            ]
+        )
+        accounts = BankAccount.objects.bulk_create(
+            [
+                BankAccount(user=user, balance=AccountService.WELCOME_BONUS)
+                for user in users
+            ]
+        )
+        bonuses = Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    account=account,
+                    amount=AccountService.WELCOME_BONUS,
+                    transaction_type=Transaction.BONUS,
+                    description="Welcome bonus",
+                    balance_after=AccountService.WELCOME_BONUS,
+                )
+                for account in accounts
+            ]
+        )
+        DailyBalanceService.record(bonuses)
+        OutboxService.record(
+            [AccountService._account_created_event(account) for account in accounts]
+        )
+
+        logger.info(f"Bulk created {len(accounts)} users with bonus")
+
+        return accounts
+
+    @staticmethod
+    def _account_created_event(
+        account: BankAccount,
+    ) -> tuple[str, str, dict[str, Any]]:
+        return (
+            OutboxEvent.ACCOUNT_CREATED,
+            account.account_number,
+            {
+                "account_number": account.account_number,
+                "welcome_bonus": str(AccountService.WELCOME_BONUS),
+            },
+        )
+
     @staticmethod
     def update_last_login(email: str) -> None:
-        User.objects.filter(email=email).update(last_login=timezone.now())
+        last_login_buffer.record(email)
@@ -0,0 +1,73 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.account.models import User
+
+
+@pytest.mark.django_db
+class TestAccountJWTAuthentication:
+    @pytest.fixture(autouse=True)
+    def _no_active_cache(self, settings):
+        settings.JWT_ACTIVE_CHECK_TTL = 0
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/api/auth/balance/"
+        self.email = "testuser@test.com"
+        self.password = "testpass123"
+
+        response = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": self.email, "password": self.password},
+            format="json",
+        )
+        self.account_number = response.data["account"]["account_number"]
+
+    def _login(self):
+        return self.client.post(
+            "/api/auth/login/",
+            {"email": self.email, "password": self.password},
+            format="json",
+        ).data
+
+    def test_token_carries_account_claims(self):
+        user = User.objects.get(email=self.email)
+
+        for token in (
+            AccessToken(self._login()["access"]),
+            RefreshToken(self._login()["refresh"]).access_token,
+        ):
+            assert token["email"] == self.email
+            assert token["account_id"] == user.bank_account.pk
+            assert token["account_number"] == self.account_number
+
+    def test_request_checks_only_active_flag(self, django_assert_num_queries):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._login()['access']}")
+        self.client.get(self.url)
+
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["account_number"] == self.account_number
+
+    def test_inactive_user_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._login()['access']}")
+        User.objects.filter(email=self.email).update(is_active=False)
+
+        assert self.client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+        assert (
+            self.client.get("/api/auth/balance/async/").status_code
+            == status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_token_without_account_claims(self):
+        token = AccessToken.for_user(User.objects.get(email=self.email))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        for url in (self.url, "/api/auth/balance/async/"):
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["account_number"] == self.account_number
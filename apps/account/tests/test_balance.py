@@ -2,6 +2,8 @@ import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from apps.account.checks import check_balance_cache
+
 
 @pytest.mark.django_db
 class TestBalance:
@@ -54,3 +56,73 @@ class TestBalance:
         assert isinstance(balance, str)
         assert "." in balance
         assert len(balance.split(".")[1]) == 2
+
+    def test_balance_reflects_committed_transfer(self):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        receiver = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "receiver@test.com", "password": self.user_password},
+            format="json",
+        )
+        assert self.client.get(self.url).data["balance"] == "10000.00"
+
+        response = self.client.post(
+            "/api/transactions/transfer",
+            {
+                "to_account_number": receiver.data["account"]["account_number"],
+                "amount": "100.00",
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        assert self.client.get(self.url).data["balance"] == "9895.00"
+
+    def test_cached_balance_needs_no_queries(self, django_assert_num_queries):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.client.get(self.url)
+
+        # The account comes from the token claims, the active flag is cached
+        with django_assert_num_queries(0):
+            response = self.client.get(self.url)
+
+        assert response.data["balance"] == "10000.00"
+
+    def test_process_local_cache_is_skipped_with_several_workers(
+        self, settings, django_assert_num_queries
+    ):
+        settings.WEB_CONCURRENCY = 4
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.client.get(self.url)
+
+        # Another worker's transfer would not reach this process's cache
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url)
+
+        assert response.data["balance"] == "10000.00"
+        [warning] = check_balance_cache()
+        assert warning.id == "account.W002"
+
+    def test_async_balance(self):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get("/api/auth/balance/async/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "account_number": self.account_number,
+            "balance": "10000.00",
+        }
+
+    def test_async_balance_unauthenticated(self):
+        response = self.client.get("/api/auth/balance/async/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        response = self.client.get("/api/auth/balance/async/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -21,3 +21,13 @@ class TestHealthCheck:
         response = self.client.get(self.url)
 
         assert response.status_code == status.HTTP_200_OK
+
+    def test_health_check_reports_connection_reuse(self):
+        response = self.client.get(self.url)
+
+        pool = response.data["database_pool"]
+        if pool["enabled"]:
+            assert pool["in_use"] >= 0
+            assert pool["waiting"] >= 0
+        else:
+            assert pool["conn_max_age"] > 0
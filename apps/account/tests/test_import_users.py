@@ -0,0 +1,71 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.account.models import BankAccount, User
+from apps.transaction.models import Transaction
+
+
+@pytest.mark.django_db
+class TestImportUsers:
+    @pytest.fixture(autouse=True)
+    def _fast_hasher(self, settings):
+        settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+    def _import(self, tmp_path, content, **options):
+        path = tmp_path / "users.csv"
+        path.write_text(content)
+        out = StringIO()
+        call_command(
+            "import_users", str(path), stdout=out, stderr=StringIO(), **options
+        )
+        return out.getvalue()
+
+    def test_import_creates_accounts_with_bonus(self, tmp_path):
+        output = self._import(
+            tmp_path,
+            "email,password\n"
+            "one@test.com,password1\n"
+            "two@test.com,password2\n"
+            "three@test.com,\n",
+            batch_size=2,
+            workers=2,
+        )
+
+        assert "Imported 3 users" in output
+        assert "rows/s" in output
+
+        user = User.objects.get(email="one@test.com")
+        assert user.check_password("password1")
+        assert not User.objects.get(email="three@test.com").has_usable_password()
+
+        accounts = BankAccount.objects.filter(
+            user__email__in=["one@test.com", "two@test.com", "three@test.com"]
+        )
+        assert len({account.account_number for account in accounts}) == 3
+        assert all(account.balance == Decimal("10000.00") for account in accounts)
+        assert (
+            Transaction.objects.filter(
+                account__in=accounts, transaction_type=Transaction.BONUS
+            ).count()
+            == 3
+        )
+
+    def test_import_skips_existing_duplicate_and_invalid_rows(self, tmp_path):
+        User.objects.create_user(email="existing@test.com", password="pass123")
+
+        output = self._import(
+            tmp_path,
+            "email,password\n"
+            "existing@test.com,password1\n"
+            "new@test.com,password2\n"
+            "new@test.com,password3\n"
+            "not-an-email,password4\n",
+            workers=1,
+        )
+
+        assert "Imported 1 users, skipped 3" in output
+        assert User.objects.get(email="new@test.com").check_password("password3")
+        assert not BankAccount.objects.filter(user__email="existing@test.com").exists()
@@ -1,7 +1,11 @@
+from datetime import timedelta
+
 import pytest
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from apps.account.last_login import LastLoginBuffer
 from apps.account.models import User
 
 
@@ -54,3 +58,32 @@ class TestLogin:
         response = self.client.post(self.url, data, format="json")
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_login_updates_last_login(self):
+        data = {"email": "testuser@test.com", "password": "testpass123"}
+
+        self.client.post(self.url, data, format="json")
+
+        self.user.refresh_from_db()
+        assert self.user.last_login is not None
+
+    def test_last_login_buffered_until_flush(self, settings, django_assert_num_queries):
+        settings.LAST_LOGIN_FLUSH_INTERVAL = 3600
+        other = User.objects.create_user(email="other@test.com", password="x")
+        earlier = timezone.now() - timedelta(minutes=5)
+        buffer = LastLoginBuffer()
+
+        with django_assert_num_queries(0):
+            buffer.record(self.user.email, earlier)
+            buffer.record(self.user.email)
+            buffer.record(other.email, earlier)
+
+        with django_assert_num_queries(1):
+            assert buffer.flush() == 2
+
+        buffer.stop()
+
+        self.user.refresh_from_db()
+        other.refresh_from_db()
+        assert self.user.last_login > earlier
+        assert other.last_login == earlier
@@ -4,7 +4,7 @@ import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from apps.account.models import User
+from apps.account.models import BankAccount, User
 from apps.transaction.models import Transaction
 
 
@@ -77,3 +77,27 @@ class TestRegistration:
         account_number = response.data["account"]["account_number"]
         assert len(account_number) == 10
         assert account_number.isdigit()
+
+    def test_account_numbers_are_unique_with_check_digit(self):
+        numbers = [
+            BankAccount.objects.create(
+                user=User.objects.create_user(email=f"user{i}@test.com", password="x")
+            ).account_number
+            for i in range(20)
+        ]
+
+        assert len(set(numbers)) == len(numbers)
+        for number in numbers:
+            digits = [int(d) for d in reversed(number)]
+            total = sum(digits[0::2]) + sum(
+                sum(divmod(d * 2, 10)) for d in digits[1::2]
+            )
+            assert total % 10 == 0
+
+    def test_account_number_allocated_by_insert(self, django_assert_num_queries):
+        user = User.objects.create_user(email="user1@test.com", password="x")
+
+        with django_assert_num_queries(1):
+            account = BankAccount.objects.create(user=user)
+
+        assert len(account.account_number) == 10
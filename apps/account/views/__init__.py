@@ -1,10 +1,12 @@
-from .balance_views import BalanceView
-from .health_views import HealthCheckView
+from .balance_views import AsyncBalanceView, BalanceView
+from .health_views import HealthCheckView, MetricsView
 from .user_views import LoginView, RegisterView
 
 __all__ = [
     "BalanceView",
+    "AsyncBalanceView",
     "RegisterView",
     "LoginView",
     "HealthCheckView",
+    "MetricsView",
 ]
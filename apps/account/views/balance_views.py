@@ -1,6 +1,7 @@
 import logging
 from typing import cast
 
+from django.http import HttpRequest, JsonResponse
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -8,7 +9,8 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.account.models import User
+from apps.account.authentication import AccountTokenUser, AsyncAPIView
+from apps.account.cache import BalanceCache
 
 from ..serializers import (
     BalanceSerializer,
@@ -22,16 +24,41 @@ class BalanceView(APIView):
 
     @extend_schema(responses={200: BalanceSerializer}, tags=["Account"])
     def get(self, request: Request) -> Response:
-        user = cast(User, request.user)
+        user = cast(AccountTokenUser, request.user)
 
-        logger.info(f"Balance request from user: {user.email}")
-        bank_account = user.bank_account
+        logger.info(
+            "Balance request from user: %s",
+            user.email,
+            extra={"sampled": True, "account": user.account_number},
+        )
+        account_number, balance = BalanceCache.get(user.account_id)
 
         serializer = BalanceSerializer(
             {
-                "account_number": bank_account.account_number,
-                "balance": bank_account.balance,
+                "account_number": account_number,
+                "balance": balance,
             }
         )
 
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AsyncBalanceView(AsyncAPIView):
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        user = cast(AccountTokenUser, request.user)
+
+        logger.info(
+            "Balance request from user: %s",
+            user.email,
+            extra={"sampled": True, "account": user.account_number},
+        )
+        account_number, balance = await BalanceCache.aget(user.account_id)
+
+        serializer = BalanceSerializer(
+            {
+                "account_number": account_number,
+                "balance": balance,
+            }
+        )
+
+        return JsonResponse(serializer.data, status=status.HTTP_200_OK)
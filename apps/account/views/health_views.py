@@ -1,14 +1,57 @@
+import hmac
 import logging
+from typing import Any
 
+from django.conf import settings
 from django.db import connection
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, BasePermission
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from simplebank import metrics
+from simplebank.log import dropped_records
+
 logger = logging.getLogger(__name__)
 
 
+def database_pool_stats() -> dict[str, Any]:
+    # Only the psycopg 3 backend has a pool, see DB_POOL_ENABLED
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return {
+            "enabled": False,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+        }
+
+    stats = pool.get_stats()
+    return {
+        "enabled": True,
+        "size": stats.get("pool_size", 0),
+        "max_size": pool.max_size,
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "available": stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": stats.get("requests_num", 0),
+        "wait_ms": stats.get("requests_wait_ms", 0),
+        "timeouts": stats.get("requests_errors", 0),
+    }
+
+
+class HasMetricsToken(BasePermission):
+    # Prometheus sends METRICS_TOKEN as a bearer token; without one configured
+    # the metrics stay closed
+    def has_permission(self, request: Request, view: APIView) -> bool:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        provided = request.headers.get("Authorization", "")
+        return bool(settings.METRICS_TOKEN) and hmac.compare_digest(
+            provided.encode(), expected.encode()
+        )
+
+
 class HealthCheckView(APIView):
     permission_classes = [AllowAny]
 
@@ -17,6 +60,7 @@ class HealthCheckView(APIView):
             "status": "ok",
             "version": "1.0.0",
             "database": self._check_database(),
+            "database_pool": database_pool_stats(),
         }
 
         if health_status["database"] == "disconnected":
@@ -31,3 +75,56 @@ class HealthCheckView(APIView):
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
             return "disconnected"
+
+
+@extend_schema(exclude=True)
+class MetricsView(APIView):
+    # Prometheus text format; histograms are filled by RequestMetricsMiddleware
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+
+    def get(self, request: Request) -> HttpResponse:
+        pool = database_pool_stats()
+        samples = [
+            (
+                "simplebank_log_records_dropped_total",
+                "counter",
+                "Log records dropped because the log queue was full",
+                dropped_records(),
+            ),
+        ]
+        if pool["enabled"]:
+            samples += [
+                (
+                    f"simplebank_db_pool_{name}",
+                    "gauge",
+                    f"Database pool connections: {name.replace('_', ' ')}",
+                    pool[name],
+                )
+                for name in ("size", "max_size", "in_use", "available", "waiting")
+            ]
+            samples += [
+                (
+                    "simplebank_db_pool_requests_total",
+                    "counter",
+                    "Connections requested from the pool",
+                    pool["requests"],
+                ),
+                (
+                    "simplebank_db_pool_wait_seconds_total",
+                    "counter",
+                    "Time spent waiting for a pool connection",
+                    pool["wait_ms"] / 1000,
+                ),
+                (
+                    "simplebank_db_pool_timeouts_total",
+                    "counter",
+                    "Pool requests that failed or timed out",
+                    pool["timeouts"],
+                ),
+            ]
+
+        return HttpResponse(
+            metrics.expose(samples),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
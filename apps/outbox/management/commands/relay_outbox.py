@@ -0,0 +1,53 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.outbox.services import OutboxService
+from apps.outbox.sinks import SINKS, get_sink
+
+
+class Command(BaseCommand):
+    help = (
+        "Publish outbox events to a sink in batches and remove them from the "
+        "outbox. Several relays may run at once."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sink",
+            help=f"{' or '.join(SINKS)} or a dotted path to a Sink subclass, "
+            "defaults to OUTBOX_SINK",
+        )
+        parser.add_argument(
+            "--path", help="File for the file sink, defaults to OUTBOX_FILE_PATH"
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Poll every N seconds once drained instead of exiting",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        sink = get_sink(
+            options["sink"], **({"path": options["path"]} if options["path"] else {})
+        )
+        interval = options["interval"]
+        total = 0
+
+        try:
+            while True:
+                relayed = OutboxService.relay_batch(sink, options["batch_size"])
+                total += relayed
+                if relayed:
+                    continue
+
+                if interval <= 0:
+                    break
+                time.sleep(interval)
+        finally:
+            sink.close()
+
+        self.stderr.write(f"Relayed {total} outbox events")
@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    ACCOUNT_CREATED = "account.created"
+    TRANSFER_COMPLETED = "transfer.completed"
+
+    EVENT_TYPES = [
+        (ACCOUNT_CREATED, "Account created"),
+        (TRANSFER_COMPLETED, "Transfer completed"),
+    ]
+
+    # Written in the same transaction as the change it describes and deleted
+    # once relayed, so the table only holds the backlog
+    id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(max_length=50, choices=EVENT_TYPES)
+    # Operation id or account number the event is about
+    aggregate_id = models.CharField(max_length=64)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "outbox_events"
+
+    def __str__(self) -> str:
+        return f"{self.id} {self.event_type} {self.aggregate_id}"
+
+    def as_message(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.event_type,
+            "aggregate_id": self.aggregate_id,
+            "created_at": self.created_at.isoformat(),
+            "payload": self.payload,
+        }
@@ -0,0 +1,48 @@
+import logging
+from typing import Any
+
+from django.db import transaction
+
+from .models import OutboxEvent
+from .sinks import Sink
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    @staticmethod
+    def record(events: list[tuple[str, str, dict[str, Any]]]) -> None:
+        # (event type, aggregate id, payload) triples; call inside the
+        # transaction that makes the change so both commit or neither does
+        OutboxEvent.objects.bulk_create(
+            OutboxEvent(
+                event_type=event_type, aggregate_id=aggregate_id, payload=payload
+            )
+            for event_type, aggregate_id, payload in events
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def relay_batch(sink: Sink, batch_size: int) -> int:
+        # SKIP LOCKED lets several relays drain the outbox side by side, each
+        # taking the oldest events nobody else holds. Delivery is at least
+        # once: a crash after publish() but before commit resends the batch,
+        # consumers deduplicate on the event id
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True).order_by("id")[
+                :batch_size
+            ]
+        )
+        if not events:
+            return 0
+
+        sink.publish([event.as_message() for event in events])
+        OutboxEvent.objects.filter(id__in=[event.id for event in events]).delete()
+
+        logger.info(
+            "Relayed %s outbox events, up to id %s",
+            len(events),
+            events[-1].id,
+            extra={"sampled": True},
+        )
+        return len(events)
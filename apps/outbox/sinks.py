@@ -0,0 +1,54 @@
+import json
+import os
+import sys
+from typing import Any, TextIO
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+SINKS = {
+    "stdout": "apps.outbox.sinks.StdoutSink",
+    "file": "apps.outbox.sinks.FileSink",
+}
+
+
+class Sink:
+    # publish() must not return before the events are durably handed over:
+    # the relay deletes them from the outbox right after. Raising leaves the
+    # whole batch in the outbox for the next attempt
+    def publish(self, messages: list[dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class StdoutSink(Sink):
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream or sys.stdout
+
+    def publish(self, messages: list[dict[str, Any]]) -> None:
+        for message in messages:
+            self.stream.write(json.dumps(message) + "\n")
+        self.stream.flush()
+
+
+class FileSink(Sink):
+    # Appends NDJSON, one event per line
+    def __init__(self, path: str | None = None) -> None:
+        self.file = open(path or settings.OUTBOX_FILE_PATH, "a")
+
+    def publish(self, messages: list[dict[str, Any]]) -> None:
+        self.file.writelines(json.dumps(message) + "\n" for message in messages)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def get_sink(name: str | None = None, **options: Any) -> Sink:
+    # `name` is an alias from SINKS or a dotted path to a Sink subclass
+    path = name or settings.OUTBOX_SINK
+    sink: Sink = import_string(SINKS.get(path, path))(**options)
+    return sink
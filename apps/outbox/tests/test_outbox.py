@@ -0,0 +1,145 @@
+import json
+import threading
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.account.services import AccountService
+from apps.outbox.models import OutboxEvent
+from apps.outbox.sinks import Sink
+from apps.transaction.services import TransactionService
+
+
+class FailingSink(Sink):
+    def publish(self, messages):
+        raise ConnectionError("Broker unavailable")
+
+
+def relay(path, **options):
+    call_command(
+        "relay_outbox", sink="file", path=str(path), stderr=StringIO(), **options
+    )
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def setup_method(self):
+        self.client = APIClient()
+        self.password = "testpass123"
+
+        accounts = []
+        for email in ["sender@test.com", "receiver@test.com"]:
+            response = self.client.post(
+                "/api/auth/sign_up/",
+                {"email": email, "password": self.password},
+                format="json",
+            )
+            accounts.append(response.data["account"]["account_number"])
+        self.sender_account_number, self.receiver_account_number = accounts
+
+        token = self.client.post(
+            "/api/auth/login/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _transfer(self, amount):
+        return self.client.post(
+            "/api/transactions/transfer",
+            {"to_account_number": self.receiver_account_number, "amount": amount},
+            format="json",
+        )
+
+    def test_changes_write_events(self):
+        response = self._transfer("100.00")
+
+        events = list(OutboxEvent.objects.order_by("id"))
+        assert [event.event_type for event in events] == [
+            OutboxEvent.ACCOUNT_CREATED,
+            OutboxEvent.ACCOUNT_CREATED,
+            OutboxEvent.TRANSFER_COMPLETED,
+        ]
+        assert events[0].aggregate_id == self.sender_account_number
+        assert events[2].aggregate_id == response.data["operation_id"]
+        assert events[2].payload == {
+            "operation_id": response.data["operation_id"],
+            "sender_account": self.sender_account_number,
+            "receiver_account": self.receiver_account_number,
+            "amount": "100.00",
+            "fee": "5.00",
+        }
+
+    def test_failed_transfer_writes_no_event(self):
+        response = self._transfer("100000.00")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not OutboxEvent.objects.filter(
+            event_type=OutboxEvent.TRANSFER_COMPLETED
+        ).exists()
+
+    def test_relay_publishes_in_order_and_empties_outbox(self, tmp_path):
+        self._transfer("100.00")
+        self._transfer("200.00")
+        ids = list(OutboxEvent.objects.order_by("id").values_list("id", flat=True))
+
+        messages = relay(tmp_path / "events.ndjson", batch_size=3)
+
+        assert [message["id"] for message in messages] == ids
+        assert messages[-1]["type"] == OutboxEvent.TRANSFER_COMPLETED
+        assert messages[-1]["payload"]["amount"] == "200.00"
+        assert not OutboxEvent.objects.exists()
+
+    def test_failed_publish_keeps_events(self):
+        with pytest.raises(ConnectionError):
+            call_command(
+                "relay_outbox",
+                sink="apps.outbox.tests.test_outbox.FailingSink",
+                stderr=StringIO(),
+            )
+
+        assert OutboxEvent.objects.count() == 2
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+class TestOutboxRelayConcurrency:
+    def test_relay_skips_events_locked_by_another_relay(self, tmp_path):
+        sender = AccountService.create_user_with_account("a@test.com", "pass")
+        receiver = AccountService.create_user_with_account("b@test.com", "pass")
+        TransactionService.execute_transfer(
+            sender["account"].pk,
+            receiver["account"].account_number,
+            Decimal("100.00"),
+        )
+        first, *rest = OutboxEvent.objects.order_by("id").values_list("id", flat=True)
+
+        locked = threading.Event()
+        release = threading.Event()
+
+        def other_relay():
+            try:
+                with transaction.atomic():
+                    OutboxEvent.objects.select_for_update().get(id=first)
+                    locked.set()
+                    release.wait(5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=other_relay)
+        thread.start()
+        assert locked.wait(5)
+        try:
+            messages = relay(tmp_path / "events.ndjson")
+        finally:
+            release.set()
+            thread.join()
+
+        assert [message["id"] for message in messages] == rest
+        assert list(OutboxEvent.objects.values_list("id", flat=True)) == [first]
@@ -0,0 +1,43 @@
+from datetime import UTC
+from typing import Any
+
+from django.core.checks import CheckMessage, Tags, Warning, register
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from .models import Transaction
+from .partitions import DEFAULT_PARTITION, add_months, list_partitions
+
+
+@register(Tags.database)
+def check_partitions(
+    app_configs: Any = None, databases: Any = None, **kwargs: Any
+) -> list[CheckMessage]:
+    if not databases or "default" not in databases:
+        return []
+
+    try:
+        partitions = list_partitions(connection, Transaction._meta.db_table)
+    except DatabaseError:
+        # Tables are not created yet, `migrate` will take care of it
+        return []
+    if not partitions:
+        return []
+
+    this_month = (
+        timezone.now()
+        .astimezone(UTC)
+        .replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    )
+    covered = partitions[-1].upper
+    if covered <= add_months(this_month, 1):
+        return [
+            Warning(
+                f"Monthly partitions of transactions end at {covered:%Y-%m-%d}, "
+                f"later rows go to {DEFAULT_PARTITION}",
+                hint="Schedule `manage_partitions` to create them ahead.",
+                id="transaction.W001",
+            )
+        ]
+
+    return []
@@ -1,5 +1,14 @@
+import base64
+from datetime import datetime
+from typing import Any
+
+from django.db.models import Q, QuerySet
 from django_filters import rest_framework as filters
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from .models import Transaction
 
@@ -20,3 +29,94 @@ class TransactionPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "limit"
     max_page_size = 100
+
+
+# Keyset pagination on (created_at, id): no COUNT(*) and no OFFSET scan,
+# so every page costs the same as the first one
+class TransactionCursorPagination(BasePagination):
+    page_size = 20
+    page_size_query_param = "limit"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any]:
+        return self._trim_page(list(self._page_queryset(queryset, request)))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any]:
+        page = self._page_queryset(queryset, request)
+        return self._trim_page([obj async for obj in page])
+
+    def _page_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        self.request = request
+        self.current_page_size = self.get_page_size(request)
+        queryset = queryset.order_by("-created_at", "-id")
+
+        if position := self.decode_cursor(request):
+            created_at, pk = position
+            # The created_at__lte bound keeps the condition an index range scan
+            queryset = queryset.filter(
+                Q(created_at__lte=created_at)
+                & (Q(created_at__lt=created_at) | Q(pk__lt=pk))
+            )
+
+        return queryset[: self.current_page_size + 1]
+
+    def _trim_page(self, results: list[Any]) -> list[Any]:
+        self.next_position = None
+        if len(results) > self.current_page_size:
+            results = results[: self.current_page_size]
+            self.next_position = (results[-1].created_at, results[-1].pk)
+
+        return results
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self) -> str | None:
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(*self.next_position),
+        )
+
+    def encode_cursor(self, created_at: datetime, pk: int) -> str:
+        raw = f"{created_at.isoformat()}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request: Request) -> tuple[datetime, int] | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            created_at, pk = raw.split("|")
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
@@ -0,0 +1,317 @@
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import StringIO
+from typing import Any
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from apps.account.models import BankAccount, User
+from apps.transaction.management.commands.seed_ledger import SEED_EMAIL_DOMAIN
+from apps.transaction.models import Transaction
+
+BENCH_PASSWORD = "benchmark-password"
+BENCH_TOP_UP = Decimal("1000000.00")
+ENDPOINTS = ["transfer", "history", "balance", "login"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the core endpoints in-process against the configured database "
+        "and print throughput, latency percentiles and queries per request as JSON. "
+        "Use a dedicated database: it seeds data and executes real transfers."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Run seed_ledger with --accounts/--transactions first",
+        )
+        parser.add_argument("--accounts", type=int, default=1000)
+        parser.add_argument("--transactions", type=int, default=100000)
+        parser.add_argument(
+            "--concurrency",
+            default="1,8",
+            help="Comma separated numbers of concurrent clients",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per scenario"
+        )
+        parser.add_argument(
+            "--login-requests",
+            type=int,
+            default=20,
+            help="Requests per login scenario, bound by password hashing",
+        )
+        parser.add_argument(
+            "--endpoints",
+            default=",".join(ENDPOINTS),
+            help=f"Comma separated subset of {', '.join(ENDPOINTS)}",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file")
+        parser.add_argument(
+            "--baseline",
+            help="Fail if p95 latency regressed against this earlier report",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.2,
+            help="Allowed p95 slowdown against --baseline (0.2 = 20%%)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        endpoints = options["endpoints"].split(",")
+        if unknown := set(endpoints) - set(ENDPOINTS):
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        levels = [int(level) for level in options["concurrency"].split(",")]
+        if min(levels) <= 0:
+            raise CommandError("--concurrency levels must be positive")
+
+        if options["seed"]:
+            call_command(
+                "seed_ledger",
+                accounts=options["accounts"],
+                transactions=options["transactions"],
+                stdout=StringIO(),
+            )
+
+        clients = self._prepare_clients(max(max(levels), 2))
+
+        scenarios = []
+        # The test client sends Host: testserver
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            for endpoint in endpoints:
+                count = (
+                    options["login_requests"]
+                    if endpoint == "login"
+                    else options["requests"]
+                )
+                for level in levels:
+                    scenarios.append(self._run(endpoint, clients, level, count))
+                    self.stderr.write(
+                        f"{endpoint} x{level}: "
+                        f"{scenarios[-1]['throughput_rps']} req/s, "
+                        f"p95 {scenarios[-1]['latency_ms']['p95']} ms"
+                    )
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.settings_dict["NAME"],
+                "transfer_fee_mode": settings.TRANSFER_FEE_MODE,
+                "transfer_concurrency_mode": settings.TRANSFER_CONCURRENCY_MODE,
+            },
+            "dataset": {
+                "accounts": BankAccount.objects.count(),
+                "transactions": Transaction.objects.count(),
+            },
+            "scenarios": scenarios,
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        self.stdout.write(output)
+
+        if options["baseline"]:
+            self._check_regressions(
+                scenarios, options["baseline"], options["max_regression"]
+            )
+
+    def _prepare_clients(self, count: int) -> list[dict[str, Any]]:
+        accounts = list(
+            BankAccount.objects.filter(user__email__endswith=f"@{SEED_EMAIL_DOMAIN}")
+            .select_related("user")
+            .order_by("pk")[:count]
+        )
+        if len(accounts) < 2:
+            raise CommandError("Not enough seeded accounts, run with --seed")
+
+        # One shared hash keeps preparation fast; the top-up is booked as a
+        # bonus so balances still match the ledger
+        with transaction.atomic():
+            User.objects.filter(pk__in=[a.user_id for a in accounts]).update(
+                password=make_password(BENCH_PASSWORD)
+            )
+            BankAccount.objects.filter(pk__in=[a.pk for a in accounts]).update(
+                balance=F("balance") + BENCH_TOP_UP, version=F("version") + 1
+            )
+            Transaction.objects.bulk_create(
+                Transaction(
+                    account=account,
+                    amount=BENCH_TOP_UP,
+                    transaction_type=Transaction.BONUS,
+                    description="Benchmark top-up",
+                )
+                for account in accounts
+            )
+
+        clients = []
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            for index, account in enumerate(accounts):
+                response = Client().post(
+                    "/api/auth/login/",
+                    {"email": account.user.email, "password": BENCH_PASSWORD},
+                    content_type="application/json",
+                )
+                if response.status_code != 200:
+                    raise CommandError(f"Login failed for {account.user.email}")
+                clients.append(
+                    {
+                        "email": account.user.email,
+                        "token": response.json()["access"],
+                        # Everyone pays the next client, so rows are contended
+                        # the way real traffic contends them
+                        "receiver": accounts[
+                            (index + 1) % len(accounts)
+                        ].account_number,
+                    }
+                )
+        return clients
+
+    def _run(
+        self,
+        endpoint: str,
+        clients: list[dict[str, Any]],
+        concurrency: int,
+        count: int,
+    ) -> dict[str, Any]:
+        request = self._request(endpoint)
+        per_worker = [
+            count // concurrency + (1 if worker < count % concurrency else 0)
+            for worker in range(concurrency)
+        ]
+
+        def work(worker: int) -> list[tuple[float, int, bool]]:
+            client = Client()
+            spec = clients[worker % len(clients)]
+            samples = []
+            try:
+                for _ in range(per_worker[worker]):
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        status_code = request(client, spec)
+                        elapsed = time.perf_counter() - started
+                    samples.append((elapsed, len(queries), status_code < 400))
+            finally:
+                if concurrency > 1:
+                    connection.close()
+            return samples
+
+        started = time.perf_counter()
+        if concurrency == 1:
+            # Inline, so the run shares the caller's connection and transaction
+            samples = work(0)
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                samples = [
+                    s for chunk in pool.map(work, range(concurrency)) for s in chunk
+                ]
+        wall = time.perf_counter() - started
+
+        latencies = sorted(sample[0] * 1000 for sample in samples)
+        queries = [sample[1] for sample in samples]
+        return {
+            "endpoint": endpoint,
+            "concurrency": concurrency,
+            "requests": len(samples),
+            "errors": sum(1 for sample in samples if not sample[2]),
+            "throughput_rps": round(len(samples) / wall, 1) if wall else 0.0,
+            "latency_ms": {
+                "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+                "p50": self._percentile(latencies, 50),
+                "p95": self._percentile(latencies, 95),
+                "p99": self._percentile(latencies, 99),
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+            "queries_per_request": {
+                "mean": round(statistics.fmean(queries), 2) if queries else 0.0,
+                "max": max(queries, default=0),
+            },
+        }
+
+    @staticmethod
+    def _request(endpoint: str) -> Callable[[Client, dict[str, Any]], int]:
+        def auth(spec: dict[str, Any]) -> dict[str, str]:
+            return {"Authorization": f"Bearer {spec['token']}"}
+
+        def transfer(client: Client, spec: dict[str, Any]) -> int:
+            return client.post(
+                "/api/transactions/transfer",
+                {"to_account_number": spec["receiver"], "amount": "1.00"},
+                content_type="application/json",
+                headers=auth(spec),
+            ).status_code
+
+        def history(client: Client, spec: dict[str, Any]) -> int:
+            return client.get("/api/transactions/", headers=auth(spec)).status_code
+
+        def balance(client: Client, spec: dict[str, Any]) -> int:
+            return client.get("/api/auth/balance/", headers=auth(spec)).status_code
+
+        def login(client: Client, spec: dict[str, Any]) -> int:
+            return client.post(
+                "/api/auth/login/",
+                {"email": spec["email"], "password": BENCH_PASSWORD},
+                content_type="application/json",
+            ).status_code
+
+        return {
+            "transfer": transfer,
+            "history": history,
+            "balance": balance,
+            "login": login,
+        }[endpoint]
+
+    @staticmethod
+    def _percentile(values: list[float], percent: int) -> float:
+        if not values:
+            return 0.0
+        if len(values) == 1:
+            return round(values[0], 2)
+        return round(
+            statistics.quantiles(values, n=100, method="inclusive")[percent - 1], 2
+        )
+
+    def _check_regressions(
+        self, scenarios: list[dict[str, Any]], path: str, max_regression: float
+    ) -> None:
+        with open(path) as file:
+            baseline = {
+                (s["endpoint"], s["concurrency"]): s
+                for s in json.load(file)["scenarios"]
+            }
+
+        regressions = []
+        for scenario in scenarios:
+            before = baseline.get((scenario["endpoint"], scenario["concurrency"]))
+            if before is None:
+                continue
+            limit = before["latency_ms"]["p95"] * (1 + max_regression)
+            if scenario["latency_ms"]["p95"] > limit:
+                regressions.append(
+                    f"{scenario['endpoint']} x{scenario['concurrency']}: "
+                    f"p95 {scenario['latency_ms']['p95']} ms "
+                    f"(baseline {before['latency_ms']['p95']} ms)"
+                )
+
+        if regressions:
+            raise CommandError("p95 regressions:\n" + "\n".join(regressions))
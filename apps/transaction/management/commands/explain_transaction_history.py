@@ -0,0 +1,120 @@
+import json
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.db.models import Count, QuerySet
+from django.http import QueryDict
+from django.utils import timezone
+
+from apps.account.models import BankAccount
+from apps.transaction.filters import TransactionFilter
+from apps.transaction.models import Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Print EXPLAIN ANALYZE plans for the transaction history queries "
+        "built by TransactionFilter. Run before and after migrating to compare."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--account",
+            help="Account number to query (default: the account with most rows)",
+        )
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--deep-page", type=int, default=500)
+        parser.add_argument("--json", action="store_true", help="Emit JSON plans")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        account = self._get_account(options["account"])
+        page_size = options["page_size"]
+        now = timezone.now()
+
+        scenarios: dict[str, tuple[dict[str, str], int]] = {
+            "first_page": ({}, 0),
+            "deep_page": ({}, page_size * (options["deep_page"] - 1)),
+            "type_filter": ({"transaction_type": Transaction.DEBIT}, 0),
+            "date_range": (
+                {
+                    "from_date": (now - timedelta(days=30)).isoformat(),
+                    "to_date": now.isoformat(),
+                },
+                0,
+            ),
+            "type_and_date_range": (
+                {
+                    "transaction_type": Transaction.CREDIT,
+                    "from_date": (now - timedelta(days=30)).isoformat(),
+                },
+                0,
+            ),
+        }
+
+        plans: dict[str, Any] = {}
+        for name, (params, offset) in scenarios.items():
+            queryset = self._filtered(account, params)
+            page = queryset.order_by("-created_at", "-id")[offset : offset + page_size]
+            plans[name] = {
+                "params": params,
+                "count": self._explain(queryset, options["json"]),
+                "page": self._explain(page, options["json"]),
+            }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(plans, indent=2))
+            return
+
+        self.stdout.write(f"Account {account.account_number} (pk={account.pk})")
+        for name, plan in plans.items():
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(f"\n== {name} {plan['params']}")
+            )
+            self.stdout.write("-- COUNT(*) (page-number pagination)")
+            self.stdout.write(plan["count"])
+            self.stdout.write("-- page")
+            self.stdout.write(plan["page"])
+
+    def _get_account(self, account_number: str | None) -> BankAccount:
+        if account_number:
+            try:
+                return BankAccount.objects.get(account_number=account_number)
+            except BankAccount.DoesNotExist as e:
+                raise CommandError(f"Account {account_number} not found") from e
+
+        busiest = (
+            Transaction.objects.values("account")
+            .annotate(rows=Count("id"))
+            .order_by("-rows")
+            .first()
+        )
+        if busiest is None:
+            raise CommandError("No transactions found, run seed_ledger first")
+        return BankAccount.objects.get(pk=busiest["account"])
+
+    def _filtered(self, account: BankAccount, params: dict[str, str]) -> QuerySet:
+        query = QueryDict(mutable=True)
+        query.update(params)
+        return TransactionFilter(
+            query, queryset=Transaction.objects.filter(account=account)
+        ).qs
+
+    def _explain(self, queryset: QuerySet, as_json: bool) -> Any:
+        explain_format = "json" if as_json else "text"
+
+        if queryset.query.is_sliced:
+            plan = queryset.explain(analyze=True, buffers=True, format=explain_format)
+            return json.loads(plan) if as_json else plan
+
+        # Mirrors the COUNT(*) issued by PageNumberPagination
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT {explain_format.upper()}) "
+                f"SELECT COUNT(*) FROM ({sql}) AS subquery",
+                params,
+            )
+            rows = [row[0] for row in cursor.fetchall()]
+        return rows[0] if as_json else "\n".join(rows)
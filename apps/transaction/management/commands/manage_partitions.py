@@ -0,0 +1,155 @@
+import gzip
+import os
+from datetime import UTC, datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.transaction.models import Transaction
+from apps.transaction.partitions import (
+    DEFAULT_PARTITION,
+    Partition,
+    add_months,
+    list_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly partitions of the transactions table ahead of time "
+        "and detach, or archive and drop, partitions older than the retention. "
+        "Rebuild daily balances (rollup_daily_balances) before archiving, "
+        "catch-up reads the ledger for accounts without an earlier rollup."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=3,
+            help="Months after the current one that must have a partition",
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            help="Detach partitions that ended more than N months before "
+            "the current month",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            help="Write detached partitions to <dir>/<partition>.csv.gz and drop them",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["ahead"] < 0 or (options["retain_months"] or 0) < 0:
+            raise CommandError("--ahead and --retain-months cannot be negative")
+        if options["archive_dir"] and options["retain_months"] is None:
+            raise CommandError("--archive-dir needs --retain-months")
+
+        self.table = Transaction._meta.db_table
+        self.dry_run = options["dry_run"]
+        partitions = list_partitions(connection, self.table)
+        if not partitions:
+            raise CommandError(f"{self.table} is not partitioned, run migrations")
+
+        this_month = (
+            timezone.now()
+            .astimezone(UTC)
+            .replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        )
+
+        # Gaps since the last run are filled too, so late rows have a home
+        covered = max(partition.upper for partition in partitions)
+        until = add_months(this_month, options["ahead"] + 1)
+        while covered < until:
+            self._create(covered, add_months(covered, 1))
+            covered = add_months(covered, 1)
+
+        if options["retain_months"] is not None:
+            cutoff = add_months(this_month, -options["retain_months"])
+            for partition in partitions:
+                if partition.upper <= cutoff:
+                    self._detach(partition, options["archive_dir"])
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM {connection.ops.quote_name(DEFAULT_PARTITION)}"
+            )
+            (stray,) = cursor.fetchone()
+        if stray:
+            self.stderr.write(
+                f"{stray} rows in {DEFAULT_PARTITION} are outside every monthly "
+                "partition, check their created_at"
+            )
+
+    def _create(self, lower: datetime, upper: datetime) -> None:
+        name = f"{self.table}_p{lower:%Y%m}"
+        self.stdout.write(f"Creating {name} for {lower:%Y-%m}")
+        if self.dry_run:
+            return
+
+        # Rows the default partition took while no partition covered the
+        # month have to move out first, or the new bound would overlap them
+        quoted = connection.ops.quote_name(name)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {quoted} "
+                f"(LIKE {connection.ops.quote_name(self.table)} INCLUDING DEFAULTS)"
+            )
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {connection.ops.quote_name(DEFAULT_PARTITION)}
+                    WHERE created_at >= %s AND created_at < %s
+                    RETURNING *
+                )
+                INSERT INTO {quoted} SELECT * FROM moved
+                """,
+                [lower, upper],
+            )
+            moved = cursor.rowcount
+            cursor.execute(
+                f"ALTER TABLE {connection.ops.quote_name(self.table)} "
+                f"ATTACH PARTITION {quoted} FOR VALUES FROM (%s) TO (%s)",
+                [lower, upper],
+            )
+        if moved:
+            self.stdout.write(f"Moved {moved} rows from {DEFAULT_PARTITION}")
+
+    def _detach(self, partition: Partition, archive_dir: str | None) -> None:
+        name = connection.ops.quote_name(partition.name)
+        self.stdout.write(f"Detaching {partition.name} (until {partition.upper:%Y-%m})")
+        if self.dry_run:
+            return
+
+        # CONCURRENTLY is not allowed next to a default partition. The plain
+        # detach only changes the catalog, but holds ACCESS EXCLUSIVE on the
+        # table for that moment, so it waits for running queries
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {connection.ops.quote_name(self.table)} "
+                f"DETACH PARTITION {name}"
+            )
+
+        if archive_dir is None:
+            return
+
+        path = os.path.join(archive_dir, f"{partition.name}.csv.gz")
+        self._archive(name, path)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {name}")
+        self.stdout.write(f"Archived {partition.name} to {path}")
+
+    def _archive(self, name: str, path: str) -> None:
+        sql = f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)"
+        with gzip.open(path, "wb") as file, connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, "copy_expert"):  # psycopg2
+                raw.copy_expert(sql, file)
+            else:
+                with raw.copy(sql) as copy:
+                    for data in copy:
+                        file.write(data)
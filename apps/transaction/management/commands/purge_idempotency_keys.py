@@ -0,0 +1,23 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.transaction.services import TransactionService
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency records whose TTL has expired"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of records deleted per statement",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        purged = TransactionService.purge_expired_idempotency_records(
+            batch_size=options["batch_size"]
+        )
+        self.stdout.write(f"Purged {purged} expired idempotency records")
@@ -0,0 +1,211 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from typing import Any, NamedTuple
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections, transaction
+from django.utils import timezone
+
+from apps.account.models import SYSTEM_USER_EMAIL, BankAccount
+from apps.transaction.models import DailyBalance, FeeBucket, Transaction
+from apps.transaction.partitions import list_partitions
+
+SIGNED = "CASE WHEN t.transaction_type = 'debit' THEN -t.amount ELSE t.amount END"
+
+# One statement per chunk, so every account is compared against a ledger
+# read from the same snapshot, however busy the tables are. Only one row per
+# account leaves the server. Opening balances cover archived partitions.
+CHUNK_SQL = f"""
+WITH ledger AS (
+    SELECT t.account_id, sum({SIGNED}) AS net, count(*) AS entries
+    FROM {Transaction._meta.db_table} AS t
+    WHERE t.account_id >= %(low)s AND t.account_id < %(high)s
+      AND t.account_id <> %(system)s
+    GROUP BY t.account_id
+),
+opening AS (
+    SELECT DISTINCT ON (d.account_id) d.account_id, d.closing_balance
+    FROM {DailyBalance._meta.db_table} AS d
+    WHERE d.account_id >= %(low)s AND d.account_id < %(high)s
+      AND d.day < %(since)s
+    ORDER BY d.account_id, d.day DESC
+)
+SELECT a.account_number, a.balance,
+       coalesce(o.closing_balance, 0.00) + coalesce(l.net, 0.00),
+       coalesce(l.entries, 0)
+FROM {BankAccount._meta.db_table} AS a
+LEFT JOIN ledger AS l ON l.account_id = a.id
+LEFT JOIN opening AS o ON o.account_id = a.id
+WHERE a.id >= %(low)s AND a.id < %(high)s AND a.id <> %(system)s
+"""
+
+# Fee rows all land on the system account, a third of the ledger, so it is
+# checked on its own: its balance plus the fees still in buckets must equal
+# the fees booked plus whatever else it was credited or debited
+SYSTEM_SQL = f"""
+SELECT a.balance,
+       (SELECT coalesce(sum(b.amount), 0.00) FROM {FeeBucket._meta.db_table} AS b),
+       coalesce((
+           SELECT d.closing_balance FROM {DailyBalance._meta.db_table} AS d
+           WHERE d.account_id = a.id AND d.day < %(since)s
+           ORDER BY d.day DESC LIMIT 1
+       ), 0.00),
+       l.fees, l.other, l.entries
+FROM {BankAccount._meta.db_table} AS a,
+LATERAL (
+    SELECT coalesce(sum(t.amount) FILTER (WHERE t.transaction_type = 'fee'), 0.00),
+           coalesce(sum({SIGNED}) FILTER (WHERE t.transaction_type <> 'fee'), 0.00),
+           count(*)
+    FROM {Transaction._meta.db_table} AS t
+    WHERE t.account_id = a.id
+) AS l(fees, other, entries)
+WHERE a.id = %(system)s
+"""
+
+
+class Mismatch(NamedTuple):
+    account_number: str
+    balance: Decimal
+    ledger: Decimal
+
+
+class ChunkResult(NamedTuple):
+    accounts: int
+    entries: int
+    mismatch_count: int
+    mismatches: list[Mismatch]  # at most --limit
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that every account balance equals the sum of its ledger entries "
+        "and that the system account holds all fees. Exits with an error if "
+        "anything does not reconcile. Point --database at a replica to keep the "
+        "load off the primary."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--database", default="default", help="Database alias to read from"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Accounts per statement, by primary key range",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Chunks checked at once, each on its own connection",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=100, help="Mismatches to print at most"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["chunk_size"] <= 0 or options["workers"] <= 0:
+            raise CommandError("--chunk-size and --workers must be positive")
+
+        self.database = options["database"]
+        self.limit = options["limit"]
+        started = time.monotonic()
+        connection = connections[self.database]
+
+        # Rows of detached partitions are gone, accounts start from their
+        # last daily rollup before the oldest remaining partition
+        partitions = list_partitions(connection, Transaction._meta.db_table)
+        self.since: date | None = None
+        if partitions and partitions[0].lower is not None:
+            self.since = timezone.localtime(partitions[0].lower).date()
+        accounts = BankAccount.objects.using(self.database)
+        self.system_pk = accounts.get(user__email=SYSTEM_USER_EMAIL).pk
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT min(id), max(id) FROM {BankAccount._meta.db_table}")
+            first, last = cursor.fetchone()
+        lows = range(first, last + 1, options["chunk_size"])
+        highs = [low + options["chunk_size"] for low in lows]
+
+        if options["workers"] == 1:
+            results = list(map(self._check_chunk, lows, highs))
+        else:
+            with ThreadPoolExecutor(options["workers"]) as pool:
+                results = list(pool.map(self._check_chunk_in_thread, lows, highs))
+
+        system_entries, fees_held = self._check_system_account()
+
+        checked = 1 + sum(result.accounts for result in results)
+        entries = system_entries + sum(result.entries for result in results)
+        mismatch_count = sum(result.mismatch_count for result in results)
+        mismatches = [m for result in results for m in result.mismatches]
+
+        for mismatch in mismatches[: self.limit]:
+            self.stdout.write(
+                f"{mismatch.account_number}: balance €{mismatch.balance}, "
+                f"ledger €{mismatch.ledger}, "
+                f"difference €{mismatch.balance - mismatch.ledger}"
+            )
+        if mismatch_count > self.limit:
+            self.stdout.write(f"... and {mismatch_count - self.limit} more")
+
+        summary = (
+            f"Checked {checked} accounts and {entries} ledger entries in "
+            f"{time.monotonic() - started:.1f}s: {mismatch_count} mismatches"
+        )
+        if not fees_held:
+            raise CommandError(f"System account does not hold all fees. {summary}")
+        if mismatch_count:
+            raise CommandError(f"Ledger does not reconcile. {summary}")
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def _check_chunk_in_thread(self, low: int, high: int) -> ChunkResult:
+        try:
+            return self._check_chunk(low, high)
+        finally:
+            connections[self.database].close()
+
+    def _check_chunk(self, low: int, high: int) -> ChunkResult:
+        accounts = entries = mismatch_count = 0
+        mismatches: list[Mismatch] = []
+
+        with (
+            transaction.atomic(using=self.database),
+            connections[self.database].cursor() as cursor,
+        ):
+            # One backend per worker, so --workers bounds the load
+            cursor.execute("SET LOCAL max_parallel_workers_per_gather = 0")
+            cursor.execute(
+                CHUNK_SQL,
+                {
+                    "low": low,
+                    "high": high,
+                    "system": self.system_pk,
+                    "since": self.since,
+                },
+            )
+            for account_number, balance, ledger, count in cursor:
+                accounts += 1
+                entries += count
+                if balance == ledger:
+                    continue
+                mismatch_count += 1
+                if len(mismatches) < self.limit:
+                    mismatches.append(Mismatch(account_number, balance, ledger))
+
+        return ChunkResult(accounts, entries, mismatch_count, mismatches)
+
+    def _check_system_account(self) -> tuple[int, bool]:
+        with connections[self.database].cursor() as cursor:
+            cursor.execute(SYSTEM_SQL, {"system": self.system_pk, "since": self.since})
+            balance, unsettled, opening, fees, other, entries = cursor.fetchone()
+
+        held = balance + unsettled - opening - other
+        self.stdout.write(
+            f"Fees: €{fees} booked, €{held} held by the system account "
+            f"(€{unsettled} of them in fee buckets)"
+        )
+        return entries, held == fees
@@ -0,0 +1,44 @@
+from datetime import date, timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from apps.transaction.services import DailyBalanceService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily balance rollups of past days from the ledger, e.g. "
+        "after bulk loads that bypass the transfer and registration paths"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--since",
+            type=date.fromisoformat,
+            help="First day to rebuild (default: yesterday)",
+        )
+        parser.add_argument(
+            "--until",
+            type=date.fromisoformat,
+            help="Day to stop before (default: today)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        today = timezone.localdate()
+        until = options["until"] or today
+        since = options["since"] or until - timedelta(days=1)
+
+        # Today's rollups are still being written by transfers
+        if until > today:
+            raise CommandError("--until cannot be after today")
+        if since >= until:
+            raise CommandError("--since must be before --until")
+
+        rebuilt = DailyBalanceService.catch_up(since, until)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {rebuilt} daily balances from {since} to {until}"
+            )
+        )
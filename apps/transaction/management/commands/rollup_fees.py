@@ -0,0 +1,29 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.transaction.services import TransactionService
+
+
+class Command(BaseCommand):
+    help = "Move fees collected in fee buckets into the system account"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Repeat every N seconds instead of running once",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        interval = options["interval"]
+
+        while True:
+            total = TransactionService.rollup_fee_buckets()
+            self.stdout.write(f"Rolled up €{total} of fees into the system account")
+
+            if interval <= 0:
+                break
+            time.sleep(interval)
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transaction", "0006_transaction_metadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeeBucket",
+            fields=[
+                (
+                    "slot",
+                    models.PositiveSmallIntegerField(primary_key=True, serialize=False),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+            ],
+            options={
+                "db_table": "fee_buckets",
+                "ordering": ["slot"],
+            },
+        ),
+    ]
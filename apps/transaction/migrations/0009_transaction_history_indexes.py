@@ -0,0 +1,54 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction, this keeps
+    # the ledger writable while the indexes are built
+    atomic = False
+
+    dependencies = [
+        ("transaction", "0008_idempotency_record"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "-created_at", "-id"],
+                name="txn_account_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("transaction_type", "fee"), _negated=True),
+                fields=["account", "transaction_type", "-created_at", "-id"],
+                name="txn_account_type_created_idx",
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'DROP INDEX CONCURRENTLY IF EXISTS "transactions_account_id_d92b47af"',
+                    reverse_sql=(
+                        "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                        '"transactions_account_id_d92b47af" '
+                        'ON "transactions" ("account_id")'
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="transaction",
+                    name="account",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=models.deletion.CASCADE,
+                        related_name="transactions",
+                        to="account.bankaccount",
+                    ),
+                ),
+            ],
+        ),
+    ]
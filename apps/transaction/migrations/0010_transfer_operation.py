@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Every transfer row repeated the transfer details as JSON; they move to one
+# transfer_operations row per transfer plus typed columns on the rows. This
+# adds the nullable columns and the table only, so it is over in a moment;
+# 0011 copies the JSON over in batches and 0012 drops it.
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0004_account_number_sequence"),
+        ("transaction", "0009_transaction_history_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="balance_after",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=12, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="counterparty",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="account.bankaccount",
+            ),
+        ),
+        migrations.CreateModel(
+            name="TransferOperation",
+            fields=[
+                ("id", models.UUIDField(primary_key=True, serialize=False)),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("fee", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("fee_bucket", models.PositiveSmallIntegerField(blank=True, null=True)),
+                ("receiver_transaction_id", models.UUIDField()),
+                ("fee_transaction_id", models.UUIDField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "receiver",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="account.bankaccount",
+                    ),
+                ),
+                (
+                    "sender",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="account.bankaccount",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "transfer_operations",
+            },
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="operation",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="transactions",
+                to="transaction.transferoperation",
+            ),
+        ),
+    ]
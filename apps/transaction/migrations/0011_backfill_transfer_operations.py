@@ -0,0 +1,125 @@
+from django.db import migrations, transaction
+
+# Copies the transfer details from the JSON on the transaction rows into
+# transfer_operations and the typed columns added by 0010. The ledger stays
+# writable meanwhile: every batch of BATCH_SIZE ids commits on its own, so
+# locks are held for one batch at a time, and a run that stops half way can
+# be started again. All operations exist before any row points to them. The
+# reverse rebuilds the JSON from those columns.
+BATCH_SIZE = 10_000
+
+BACKFILL_OPERATIONS = """
+INSERT INTO transfer_operations (
+    id, sender_id, receiver_id, amount, fee, fee_bucket,
+    receiver_transaction_id, fee_transaction_id, created_at
+)
+SELECT t.transaction_id, t.account_id, r.account_id,
+       (t.metadata->>'transfer_amount')::numeric,
+       (t.metadata->>'fee')::numeric,
+       (f.metadata->>'fee_bucket')::smallint,
+       r.transaction_id,
+       (t.metadata->>'fee_txn_id')::uuid,
+       t.created_at
+FROM transactions AS t
+JOIN transactions AS r ON r.transaction_id = (t.metadata->>'receiver_txn_id')::uuid
+LEFT JOIN transactions AS f ON f.transaction_id = (t.metadata->>'fee_txn_id')::uuid
+WHERE t.metadata->>'operation' = 'transfer' AND t.metadata->>'role' = 'sender'
+  AND t.id >= %s AND t.id < %s
+ON CONFLICT (id) DO NOTHING
+"""
+
+BACKFILL_ROWS = """
+UPDATE transactions AS t
+SET operation_id = op.id,
+    counterparty_id = CASE t.metadata->>'role'
+        WHEN 'sender' THEN op.receiver_id ELSE op.sender_id
+    END,
+    balance_after = (t.metadata->>'balance_after')::numeric
+FROM transfer_operations AS op
+WHERE t.metadata->>'operation' = 'transfer'
+  AND op.id = (t.metadata->>'operation_id')::uuid
+  AND t.id >= %s AND t.id < %s
+"""
+
+RESTORE_METADATA = """
+UPDATE transactions AS t
+SET metadata = jsonb_build_object(
+        'operation', 'transfer',
+        'operation_id', op.id::text,
+        'receiver_txn_id', op.receiver_transaction_id::text,
+        'fee_txn_id', op.fee_transaction_id::text,
+        'transfer_amount', op.amount::text
+    ) || CASE t.transaction_type
+        WHEN 'debit' THEN jsonb_build_object(
+            'role', 'sender',
+            'counterparty_account', receiver.account_number,
+            'fee', op.fee::text,
+            'total_debited', t.amount::text,
+            'balance_before', (t.balance_after + t.amount)::text,
+            'balance_after', t.balance_after::text
+        )
+        WHEN 'credit' THEN jsonb_build_object(
+            'role', 'receiver',
+            'counterparty_account', sender.account_number,
+            'balance_before', (t.balance_after - t.amount)::text,
+            'balance_after', t.balance_after::text
+        )
+        ELSE jsonb_build_object(
+            'role', 'fee',
+            'sender_account', sender.account_number,
+            'receiver_account', receiver.account_number
+        ) || CASE WHEN op.fee_bucket IS NOT NULL
+            THEN jsonb_build_object('fee_bucket', op.fee_bucket)
+            ELSE jsonb_build_object(
+                'balance_before', (t.balance_after - t.amount)::text,
+                'balance_after', t.balance_after::text
+            )
+        END
+    END
+FROM transfer_operations AS op
+JOIN bank_accounts AS sender ON sender.id = op.sender_id
+JOIN bank_accounts AS receiver ON receiver.id = op.receiver_id
+WHERE t.operation_id = op.id AND t.id >= %s AND t.id < %s
+"""
+
+# Rows written since 0010 by code without the column hold NULL, they get the
+# empty object the field defaults to
+CLEAR_METADATA = """
+UPDATE transactions SET metadata = '{}'
+WHERE metadata IS NULL AND id >= %s AND id < %s
+"""
+
+
+def run_in_batches(schema_editor, statements):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT min(id), max(id) FROM transactions")
+        first, last = cursor.fetchone()
+    if first is None:
+        return
+
+    for sql in statements:
+        for lower in range(first, last + 1, BATCH_SIZE):
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute(sql, [lower, lower + BATCH_SIZE])
+
+
+def backfill_transfer_operations(apps, schema_editor):
+    run_in_batches(schema_editor, [BACKFILL_OPERATIONS, BACKFILL_ROWS])
+
+
+def restore_metadata(apps, schema_editor):
+    run_in_batches(schema_editor, [CLEAR_METADATA, RESTORE_METADATA])
+
+
+class Migration(migrations.Migration):
+    # Each batch opens its own transaction
+    atomic = False
+
+    dependencies = [
+        ("transaction", "0010_transfer_operation"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_transfer_operations, restore_metadata),
+    ]
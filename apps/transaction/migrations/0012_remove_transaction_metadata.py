@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Only after 0011 finished, so the JSON is never the sole copy of a
+    # transfer's details
+    dependencies = [
+        ("transaction", "0011_backfill_transfer_operations"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="transaction",
+            name="metadata",
+        ),
+    ]
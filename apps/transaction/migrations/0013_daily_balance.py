@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Rollups are written by transfers from now on, the days before only exist in
+# the ledger. Today is included: the code recording rollups is not serving
+# yet, and its first write of the day adds to this row. One pass over the
+# ledger; `rollup_daily_balances` rebuilds a range if it has to be redone.
+BACKFILL_DAILY_BALANCES = """
+INSERT INTO daily_balances (
+    account_id, day, opening_balance, closing_balance,
+    credit_total, debit_total, bonus_total, fee_total, transaction_count
+)
+SELECT account_id, day,
+       sum(net) OVER running - net,
+       sum(net) OVER running,
+       credit_total, debit_total, bonus_total, fee_total, transaction_count
+FROM (
+    SELECT account_id,
+           (created_at AT TIME ZONE %s)::date AS day,
+           coalesce(sum(amount) FILTER (WHERE transaction_type = 'credit'), 0)
+               AS credit_total,
+           coalesce(sum(amount) FILTER (WHERE transaction_type = 'debit'), 0)
+               AS debit_total,
+           coalesce(sum(amount) FILTER (WHERE transaction_type = 'bonus'), 0)
+               AS bonus_total,
+           coalesce(sum(amount) FILTER (WHERE transaction_type = 'fee'), 0)
+               AS fee_total,
+           count(*) AS transaction_count,
+           sum(CASE WHEN transaction_type = 'debit' THEN -amount ELSE amount END)
+               AS net
+    FROM transactions
+    GROUP BY 1, 2
+) AS daily
+WINDOW running AS (PARTITION BY account_id ORDER BY day)
+"""
+
+
+class Migration(migrations.Migration):
+    # The table is committed before the backfill scans the ledger, which then
+    # runs as a single statement of its own
+    atomic = False
+
+    dependencies = [
+        ("account", "0004_account_number_sequence"),
+        ("transaction", "0012_remove_transaction_metadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyBalance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "opening_balance",
+                    models.DecimalField(decimal_places=2, max_digits=12),
+                ),
+                (
+                    "closing_balance",
+                    models.DecimalField(decimal_places=2, max_digits=12),
+                ),
+                (
+                    "credit_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "debit_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "bonus_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "fee_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("transaction_count", models.PositiveIntegerField(default=0)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="account.bankaccount",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "daily_balances",
+                "ordering": ["account", "day"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("account", "day"), name="daily_balance_account_day_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            [(BACKFILL_DAILY_BALANCES, [settings.TIME_ZONE])],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,152 @@
+import uuid
+from datetime import UTC, datetime
+
+from django.db import migrations, models, transaction
+from django.db.migrations.exceptions import IrreversibleError
+
+# Turns `transactions` into a table range partitioned by month on created_at.
+# The existing table is kept as the first partition, covering everything up
+# to the end of the current month, so no rows are copied; the following
+# months get their own partitions, created ahead by `manage_partitions`. A
+# DEFAULT partition takes rows no month covers yet, so writes keep working
+# if that command stops running, and `manage_partitions` moves them out.
+#
+# The partition key has to be part of every unique index, so the primary key
+# becomes (id, created_at) and transaction_id loses its unique constraint;
+# operation ids stay unique through transfer_operations. Partitioned tables
+# cannot have identity columns before PostgreSQL 17, so id moves to a plain
+# sequence continuing from the current maximum.
+#
+# The ledger stays writable while anything scans the table: the new primary
+# key index is built CONCURRENTLY and the partition bound is proven by a
+# CHECK constraint validated under a lock that allows writes, so the final
+# swap under ACCESS EXCLUSIVE only changes the catalog.
+BUILD_PRIMARY_KEY_INDEX = """
+CREATE UNIQUE INDEX CONCURRENTLY transactions_legacy_pkey
+    ON transactions (id, created_at)
+"""
+
+ADD_BOUND = """
+ALTER TABLE transactions ADD CONSTRAINT transactions_legacy_bound
+    CHECK (created_at < %s) NOT VALID
+"""
+
+VALIDATE_BOUND = (
+    "ALTER TABLE transactions VALIDATE CONSTRAINT transactions_legacy_bound"
+)
+
+SWAP_TABLES = [
+    "LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE",
+    "ALTER TABLE transactions RENAME TO transactions_legacy",
+    "ALTER INDEX txn_account_created_idx "
+    "RENAME TO transactions_legacy_account_created_idx",
+    "ALTER INDEX txn_account_type_created_idx "
+    "RENAME TO transactions_legacy_account_type_created_idx",
+    "ALTER TABLE transactions_legacy DROP CONSTRAINT transactions_pkey",
+    "ALTER TABLE transactions_legacy ADD CONSTRAINT transactions_legacy_pkey "
+    "PRIMARY KEY USING INDEX transactions_legacy_pkey",
+    "ALTER TABLE transactions_legacy ALTER COLUMN id DROP IDENTITY",
+    "CREATE SEQUENCE transactions_id_seq",
+    "SELECT setval('transactions_id_seq', coalesce(max(id), 0) + 1, false) "
+    "FROM transactions_legacy",
+    "CREATE TABLE transactions (LIKE transactions_legacy) "
+    "PARTITION BY RANGE (created_at)",
+    "ALTER TABLE transactions "
+    "ALTER COLUMN id SET DEFAULT nextval('transactions_id_seq')",
+    "ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id",
+    "ALTER TABLE transactions "
+    "ADD CONSTRAINT transactions_pkey PRIMARY KEY (id, created_at)",
+]
+
+# The validated bound implies the partition constraint, so the attach skips
+# scanning the rows
+ATTACH_LEGACY = """
+ALTER TABLE transactions ATTACH PARTITION transactions_legacy
+    FOR VALUES FROM (MINVALUE) TO (%s)
+"""
+
+DROP_BOUND = "ALTER TABLE transactions_legacy DROP CONSTRAINT transactions_legacy_bound"
+
+CREATE_MONTH = """
+CREATE TABLE {name} PARTITION OF transactions FOR VALUES FROM (%s) TO (%s)
+"""
+
+# Created after the attach so the legacy table's indexes and foreign keys
+# are adopted instead of rebuilt
+FINISH_PARENT = [
+    "CREATE TABLE transactions_default PARTITION OF transactions DEFAULT",
+    "CREATE INDEX txn_account_created_idx "
+    "ON transactions (account_id, created_at DESC, id DESC)",
+    "CREATE INDEX txn_account_type_created_idx "
+    "ON transactions (account_id, transaction_type, created_at DESC, id DESC) "
+    "WHERE NOT (transaction_type = 'fee')",
+    "ALTER TABLE transactions "
+    "ADD CONSTRAINT transactions_account_id_d92b47af_fk_bank_accounts_id "
+    "FOREIGN KEY (account_id) REFERENCES bank_accounts (id) "
+    "DEFERRABLE INITIALLY DEFERRED",
+    "ALTER TABLE transactions "
+    "ADD CONSTRAINT transactions_counterparty_id_040b0801_fk_bank_accounts_id "
+    "FOREIGN KEY (counterparty_id) REFERENCES bank_accounts (id) "
+    "DEFERRABLE INITIALLY DEFERRED",
+    "ALTER TABLE transactions "
+    "ADD CONSTRAINT transactions_operation_id_895aaaa0_fk_transfer_operations_id "
+    "FOREIGN KEY (operation_id) REFERENCES transfer_operations (id) "
+    "DEFERRABLE INITIALLY DEFERRED",
+]
+
+
+def add_months(moment, months):
+    month = moment.month - 1 + months
+    return moment.replace(year=moment.year + month // 12, month=month % 12 + 1)
+
+
+def partition_transactions(apps, schema_editor):
+    this_month = datetime.now(UTC).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    boundary = add_months(this_month, 1)
+
+    schema_editor.execute(BUILD_PRIMARY_KEY_INDEX)
+    schema_editor.execute(ADD_BOUND, [boundary])
+    schema_editor.execute(VALIDATE_BOUND)
+
+    with transaction.atomic(using=schema_editor.connection.alias):
+        for sql in SWAP_TABLES:
+            schema_editor.execute(sql)
+        schema_editor.execute(ATTACH_LEGACY, [boundary])
+        schema_editor.execute(DROP_BOUND)
+        for months in range(1, 4):
+            lower = add_months(this_month, months)
+            schema_editor.execute(
+                CREATE_MONTH.format(name=f"transactions_p{lower:%Y%m}"),
+                [lower, add_months(lower, 1)],
+            )
+        for sql in FINISH_PARENT:
+            schema_editor.execute(sql)
+
+
+def unpartition_transactions(apps, schema_editor):
+    raise IrreversibleError(
+        "Partitioning transactions cannot be reversed: merging the partitions "
+        "back into one table would copy every row under a full table lock. "
+        "Restore a backup taken before this migration instead."
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; the table
+    # swap opens its own
+    atomic = False
+
+    dependencies = [
+        ("transaction", "0013_daily_balance"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="transaction",
+            name="transaction_id",
+            field=models.UUIDField(default=uuid.uuid4),
+        ),
+        migrations.RunPython(partition_transactions, unpartition_transactions),
+    ]
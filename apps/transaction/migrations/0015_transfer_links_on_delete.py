@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0005_bankaccount_version"),
+        ("transaction", "0014_partition_transactions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="transaction",
+            name="counterparty",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="account.bankaccount",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="transaction",
+            name="operation",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="transactions",
+                to="transaction.transferoperation",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="transferoperation",
+            name="receiver",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="account.bankaccount",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="transferoperation",
+            name="sender",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="account.bankaccount",
+            ),
+        ),
+    ]
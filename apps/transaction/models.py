@@ -5,6 +5,33 @@ from django.db import models
 from apps.account.models import BankAccount
 
 
+class TransferOperation(models.Model):
+    # One row per transfer; its ledger rows point here instead of each
+    # repeating the transfer details
+    id = models.UUIDField(primary_key=True)  # the sender row's transaction_id
+    # Goes with either account, like the account's own rows; the other
+    # side keeps its rows with the links cleared
+    sender = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    receiver = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    fee = models.DecimalField(max_digits=12, decimal_places=2)
+    # Set when the fee went to a fee bucket instead of the system account
+    fee_bucket = models.PositiveSmallIntegerField(null=True, blank=True)
+    receiver_transaction_id = models.UUIDField()
+    fee_transaction_id = models.UUIDField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "transfer_operations"
+
+    def __str__(self) -> str:
+        return f"Transfer {self.id}: {self.amount}"
+
+
 class Transaction(models.Model):
     CREDIT = "credit"
     DEBIT = "debit"
@@ -18,19 +45,115 @@ class Transaction(models.Model):
         (FEE, "Fee"),
     ]
 
+    # Covered by the composite indexes below, which lead with the account
     account = models.ForeignKey(
-        BankAccount, on_delete=models.CASCADE, related_name="transactions"
+        BankAccount,
+        on_delete=models.CASCADE,
+        related_name="transactions",
+        db_index=False,
     )
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     transaction_type = models.CharField(max_length=10, choices=TRANSACTION_TYPE_CHOICES)
     description = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    transaction_id = models.UUIDField(unique=True, default=uuid.uuid4)
-    metadata = models.JSONField(null=True, blank=True, default=dict)
+    # Not unique: the table is partitioned by created_at (migration 0014),
+    # operation ids are unique through TransferOperation
+    transaction_id = models.UUIDField(default=uuid.uuid4)
+    # Transfer rows only
+    operation = models.ForeignKey(
+        TransferOperation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="transactions",
+        db_index=False,
+    )
+    counterparty = models.ForeignKey(
+        BankAccount,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_index=False,
+    )
+    # Balance of `account` after this row; empty for fees held in a bucket
+    balance_after = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True
+    )
 
     class Meta:
         db_table = "transactions"
         ordering = ["-created_at"]
+        indexes = [
+            # History pages, date ranges and cursor pagination
+            models.Index(
+                fields=["account", "-created_at", "-id"],
+                name="txn_account_created_idx",
+            ),
+            # transaction_type filter; fee rows only ever belong to the system
+            # account, so they are left out to keep the index a third smaller
+            models.Index(
+                fields=["account", "transaction_type", "-created_at", "-id"],
+                name="txn_account_type_created_idx",
+                condition=~models.Q(transaction_type="fee"),
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.transaction_type} {self.amount} - {self.account.account_number}"
+
+
+class DailyBalance(models.Model):
+    # One row per account and day with activity, kept current by the
+    # transfer and registration paths; rebuilt by `rollup_daily_balances`
+    account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    day = models.DateField()
+    opening_balance = models.DecimalField(max_digits=12, decimal_places=2)
+    closing_balance = models.DecimalField(max_digits=12, decimal_places=2)
+    credit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    debit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    bonus_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    fee_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    transaction_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "daily_balances"
+        ordering = ["account", "day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "day"], name="daily_balance_account_day_uniq"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.account_id} {self.day}: {self.closing_balance}"
+
+
+class FeeBucket(models.Model):
+    slot = models.PositiveSmallIntegerField(primary_key=True)
+    amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "fee_buckets"
+        ordering = ["slot"]
+
+    def __str__(self) -> str:
+        return f"Fee bucket {self.slot}: {self.amount}"
+
+
+class IdempotencyRecord(models.Model):
+    key = models.UUIDField(primary_key=True)
+    account = models.ForeignKey(
+        BankAccount, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    response = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "idempotency_records"
+
+    def __str__(self) -> str:
+        return f"{self.key} (expires {self.expires_at})"
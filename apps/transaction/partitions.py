@@ -0,0 +1,58 @@
+import re
+from calendar import monthrange
+from datetime import datetime
+from typing import NamedTuple
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .models import Transaction
+
+BOUND = re.compile(r"FROM \((?P<lower>[^)]+)\) TO \((?P<upper>[^)]+)\)")
+# Catches rows no monthly partition covers yet
+DEFAULT_PARTITION = f"{Transaction._meta.db_table}_default"
+
+
+class Partition(NamedTuple):
+    name: str
+    lower: datetime | None  # None for MINVALUE
+    upper: datetime
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    # Days past the end of the target month clamp to its last day
+    month = moment.month - 1 + months
+    year, month = moment.year + month // 12, month % 12 + 1
+    return moment.replace(
+        year=year, month=month, day=min(moment.day, monthrange(year, month)[1])
+    )
+
+
+def list_partitions(connection: BaseDatabaseWrapper, table: str) -> list[Partition]:
+    # Range partitions oldest first, empty if the table is not partitioned
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits AS i
+            JOIN pg_class AS c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [table],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        if bound == "DEFAULT":
+            continue
+        match = BOUND.search(bound)
+        if match is None:
+            raise ValueError(f"Unexpected bound for {name}: {bound}")
+        lower, upper = (
+            None if value == "MINVALUE" else datetime.fromisoformat(value.strip("'"))
+            for value in (match["lower"], match["upper"])
+        )
+        assert upper is not None
+        partitions.append(Partition(name, lower, upper))
+
+    return sorted(partitions, key=lambda partition: partition.upper)
@@ -1,4 +1,25 @@
+from .statement_serializer import (
+    DailyStatementSerializer,
+    StatementQuerySerializer,
+    StatementSerializer,
+)
 from .transaction_serializer import TransactionSerializer
-from .transfer_serializer import TransferResponseSerializer, TransferSerializer
+from .transfer_serializer import (
+    BatchTransferItemSerializer,
+    BatchTransferResponseSerializer,
+    BatchTransferSerializer,
+    TransferResponseSerializer,
+    TransferSerializer,
+)
 
-__all__ = ["TransactionSerializer", "TransferSerializer", "TransferResponseSerializer"]
+__all__ = [
+    "TransactionSerializer",
+    "TransferSerializer",
+    "TransferResponseSerializer",
+    "BatchTransferSerializer",
+    "BatchTransferItemSerializer",
+    "BatchTransferResponseSerializer",
+    "StatementQuerySerializer",
+    "StatementSerializer",
+    "DailyStatementSerializer",
+]
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from ..services import DailyBalanceService
+
+
+class StatementQuerySerializer(serializers.Serializer):
+    DEFAULT_DAYS = 30
+
+    from_date = serializers.DateField(required=False)
+    to_date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        to_date = attrs.get("to_date") or timezone.localdate()
+        from_date = attrs.get("from_date") or to_date - timedelta(
+            days=self.DEFAULT_DAYS - 1
+        )
+
+        if from_date > to_date:
+            raise serializers.ValidationError("from_date must not be after to_date")
+        if (to_date - from_date).days >= DailyBalanceService.MAX_STATEMENT_DAYS:
+            raise serializers.ValidationError(
+                f"At most {DailyBalanceService.MAX_STATEMENT_DAYS} days per statement"
+            )
+
+        return {"from_date": from_date, "to_date": to_date}
+
+
+class DailyStatementSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    opening_balance = serializers.DecimalField(max_digits=12, decimal_places=2)
+    closing_balance = serializers.DecimalField(max_digits=12, decimal_places=2)
+    credit = serializers.DecimalField(max_digits=14, decimal_places=2)
+    debit = serializers.DecimalField(max_digits=14, decimal_places=2)
+    bonus = serializers.DecimalField(max_digits=14, decimal_places=2)
+    fee = serializers.DecimalField(max_digits=14, decimal_places=2)
+    transaction_count = serializers.IntegerField()
+
+
+class StatementSerializer(serializers.Serializer):
+    account_number = serializers.CharField()
+    from_date = serializers.DateField()
+    to_date = serializers.DateField()
+    days = DailyStatementSerializer(many=True)
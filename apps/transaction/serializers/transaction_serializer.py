@@ -1,9 +1,18 @@
+from typing import Any
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from ..models import Transaction
 
 
 class TransactionSerializer(serializers.ModelSerializer):
+    # Transfer details used to be stored as JSON on every row; the same
+    # object is now built from the transfer operation. Expects the queryset
+    # to select_related("operation__sender", "operation__receiver").
+    metadata = serializers.SerializerMethodField()
+
     class Meta:
         model = Transaction
         fields = [
@@ -15,3 +24,53 @@ class TransactionSerializer(serializers.ModelSerializer):
             "metadata",
         ]
         read_only_fields = fields
+
+    @extend_schema_field(OpenApiTypes.OBJECT)
+    def get_metadata(self, obj: Transaction) -> dict[str, Any]:
+        operation = obj.operation
+        if operation is None:
+            return {}
+
+        metadata: dict[str, Any] = {
+            "operation": "transfer",
+            "operation_id": str(operation.id),
+            "receiver_txn_id": str(operation.receiver_transaction_id),
+            "fee_txn_id": str(operation.fee_transaction_id),
+        }
+
+        if obj.transaction_type == Transaction.DEBIT:
+            assert obj.balance_after is not None
+            metadata.update(
+                role="sender",
+                counterparty_account=operation.receiver.account_number,
+                transfer_amount=str(operation.amount),
+                fee=str(operation.fee),
+                total_debited=str(obj.amount),
+                balance_before=str(obj.balance_after + obj.amount),
+                balance_after=str(obj.balance_after),
+            )
+        elif obj.transaction_type == Transaction.CREDIT:
+            assert obj.balance_after is not None
+            metadata.update(
+                role="receiver",
+                counterparty_account=operation.sender.account_number,
+                transfer_amount=str(operation.amount),
+                balance_before=str(obj.balance_after - obj.amount),
+                balance_after=str(obj.balance_after),
+            )
+        else:
+            metadata.update(
+                role="fee",
+                sender_account=operation.sender.account_number,
+                receiver_account=operation.receiver.account_number,
+                transfer_amount=str(operation.amount),
+            )
+            if operation.fee_bucket is not None:
+                metadata["fee_bucket"] = operation.fee_bucket
+            elif obj.balance_after is not None:
+                metadata.update(
+                    balance_before=str(obj.balance_after - obj.amount),
+                    balance_after=str(obj.balance_after),
+                )
+
+        return metadata
@@ -26,3 +26,33 @@ class TransferResponseSerializer(serializers.Serializer):
     total_debited = serializers.CharField()
     sender_balance_before = serializers.CharField()
     sender_balance_after = serializers.CharField()
+
+
+class BatchTransferSerializer(serializers.Serializer):
+    MAX_TRANSFERS = 1000
+
+    transfers = TransferSerializer(many=True, allow_empty=False)
+    all_or_nothing = serializers.BooleanField(default=False)
+
+    def validate_transfers(self, value):
+        if len(value) > self.MAX_TRANSFERS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_TRANSFERS} transfers per batch"
+            )
+        return value
+
+
+class BatchTransferItemSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    operation_id = serializers.CharField()
+    status = serializers.ChoiceField(
+        choices=["completed", "duplicate", "failed", "rejected"]
+    )
+    result = TransferResponseSerializer(required=False)
+    error = serializers.CharField(required=False)
+
+
+class BatchTransferResponseSerializer(serializers.Serializer):
+    completed = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = BatchTransferItemSerializer(many=True)
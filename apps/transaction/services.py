@@ -1,17 +1,61 @@
 import logging
+import random
 import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Any
+from time import sleep
+from typing import Any, NamedTuple, TypeVar
 
-from django.db import transaction
-from django.db.models import F
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
+from apps.account.cache import BalanceCache
 from apps.account.models import BankAccount
+from apps.outbox.models import OutboxEvent
+from apps.outbox.services import OutboxService
+from simplebank import metrics
 
-from .models import Transaction
+from .models import (
+    DailyBalance,
+    FeeBucket,
+    IdempotencyRecord,
+    Transaction,
+    TransferOperation,
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# SQLSTATEs after which the same transaction may well succeed on a retry
+TRANSIENT_ERRORS = {
+    "40P01": "deadlock",
+    "40001": "serialization_failure",
+    "55P03": "lock_timeout",
+}
+
+
+def _sqlstate(error: OperationalError) -> str:
+    # psycopg 3 calls it sqlstate, psycopg2 pgcode
+    cause = error.__cause__
+    return getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None) or ""
+
+
+class TransferConflictError(Exception):
+    pass
+
+
+class PlannedTransfer(NamedTuple):
+    operation_id: uuid.UUID
+    receiver: BankAccount
+    amount: Decimal
+    fee: Decimal
+    store_result: bool
+
 
 class TransactionService:
     FEE_PERCENTAGE = Decimal("0.025")  # 2.5%
@@ -25,9 +69,8 @@ class TransactionService:
         return round(Decimal(max(fee, TransactionService.MIN_FEE)), 2)
 
     @staticmethod
-    @transaction.atomic
     def execute_transfer(
-        sender_account: BankAccount,
+        sender_account_id: int,
         to_account_number: str,
         amount: Decimal,
         transaction_id: uuid.UUID | None = None,
@@ -35,162 +78,782 @@ class TransactionService:
         if amount <= 0:
             raise ValueError("Transfer amount must be positive")
 
-        transfer_operation_id = transaction_id or uuid.uuid4()
-
-        if existing_txn := Transaction.objects.filter(
-            transaction_id=transfer_operation_id
-        ).first():
-            logger.warning(f"Duplicate transaction attempt: {transfer_operation_id}")
-
-            assert existing_txn.metadata is not None
-
-            receiver_transaction_id = existing_txn.metadata.get("receiver_txn_id")
-            fee_transaction_id = existing_txn.metadata.get("fee_txn_id")
-            fee_txn = existing_txn.metadata.get("fee")
-            total_debit = existing_txn.metadata.get("total_debited")
-            sender_balance_before = existing_txn.metadata.get("balance_before")
-            sender_balance_after = existing_txn.metadata.get("balance_after")
-            transfer_amount = existing_txn.metadata.get("transfer_amount")
-            transfer_fee = existing_txn.metadata.get("fee")
-
-            return {
-                "operation_id": str(transfer_operation_id),
-                "sender_transaction_id": str(transfer_operation_id),
-                "receiver_transaction_id": str(receiver_transaction_id),
-                "fee_transaction_id": str(fee_transaction_id),
-                "amount": str(transfer_amount),
-                "fee": str(transfer_fee),
-                "total_debited": str(total_debit),
-                "sender_balance_before": str(sender_balance_before),
-                "sender_balance_after": str(sender_balance_after),
-            }
+        if transaction_id is None:
+            return TransactionService._run_transfer(
+                sender_account_id, to_account_number, amount, uuid.uuid4()
+            )
+
+        # Retries are answered from the idempotency store with a single
+        # primary key lookup, without opening a write transaction
+        if stored := TransactionService._replay_stored_transfer(
+            transaction_id, sender_account_id
+        ):
+            return stored
 
         try:
-            receiver_account = BankAccount.objects.get(account_number=to_account_number)
-        except BankAccount.DoesNotExist as e:
-            raise ValueError(f"Account {to_account_number} not found") from e
+            return TransactionService._run_transfer(
+                sender_account_id,
+                to_account_number,
+                amount,
+                transaction_id,
+                store_result=True,
+            )
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            if stored := TransactionService._replay_stored_transfer(
+                transaction_id, sender_account_id
+            ):
+                return stored
+            if TransferOperation.objects.filter(pk=transaction_id).exists():
+                raise ValueError(
+                    f"Transaction {transaction_id} was already processed"
+                ) from None
+            raise
 
-        if sender_account.pk == receiver_account.pk:
-            raise ValueError("Cannot transfer to yourself")
+    @staticmethod
+    def _replay_stored_transfer(
+        key: uuid.UUID, account_pk: int
+    ) -> dict[str, Any] | None:
+        # The response stored for a retried key, logged as a duplicate
+        stored = (
+            IdempotencyRecord.objects.filter(
+                key=key, account_id=account_pk, expires_at__gt=timezone.now()
+            )
+            .values_list("response", flat=True)
+            .first()
+        )
+        if stored is not None:
+            logger.warning(
+                f"Duplicate transaction attempt: {key}",
+                extra={"operation_id": str(key), "account_id": account_pk},
+            )
+        return stored
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # Full jitter, so retries of colliding requests spread out instead of
+        # colliding again
+        return random.uniform(0, settings.TRANSFER_RETRY_BACKOFF * 2**attempt)
 
-        # Lock accounts
-        locked_accounts = list(
-            BankAccount.objects.select_for_update()
-            .filter(pk__in=[sender_account.pk, receiver_account.pk])
-            .order_by("pk")
+    @staticmethod
+    def _retry_transient(operation: str, func: Callable[..., T], *args: Any) -> T:
+        # Only the owner of the transaction can retry it: inside an outer
+        # atomic block the locks taken earlier are still held and the
+        # caller has to roll back first
+        attempt = 0
+        while True:
+            try:
+                return func(*args)
+            except OperationalError as error:
+                reason = TRANSIENT_ERRORS.get(_sqlstate(error))
+                if (
+                    reason is None
+                    or connection.in_atomic_block
+                    or attempt >= settings.TRANSFER_RETRY_ATTEMPTS
+                ):
+                    raise
+
+                attempt += 1
+                metrics.DB_RETRIES.inc(operation=operation, reason=reason)
+                delay = TransactionService._backoff(attempt)
+                logger.warning(
+                    f"{operation} aborted by {reason}, retry {attempt} of "
+                    f"{settings.TRANSFER_RETRY_ATTEMPTS} in {delay * 1000:.0f} ms"
+                )
+                sleep(delay)
+
+    @staticmethod
+    def _run_transfer(
+        sender_account_id: int,
+        to_account_number: str,
+        amount: Decimal,
+        transfer_operation_id: uuid.UUID,
+        store_result: bool = False,
+    ) -> dict[str, Any]:
+        # Every attempt rolls back completely, so retrying with the same
+        # operation id cannot book the transfer twice
+        optimistic = settings.TRANSFER_CONCURRENCY_MODE == "optimistic"
+        attempt = 0
+        while True:
+            try:
+                return TransactionService._retry_transient(
+                    "transfer",
+                    TransactionService._execute_transfer,
+                    sender_account_id,
+                    to_account_number,
+                    amount,
+                    transfer_operation_id,
+                    store_result,
+                    optimistic,
+                )
+            except TransferConflictError:
+                metrics.TRANSFER_CONFLICTS.inc()
+                if attempt >= settings.TRANSFER_OPTIMISTIC_RETRIES:
+                    logger.warning(
+                        f"Transfer {transfer_operation_id} gave up after "
+                        f"{attempt + 1} conflicting attempts",
+                        extra={
+                            "operation_id": str(transfer_operation_id),
+                            "account_id": sender_account_id,
+                        },
+                    )
+                    raise
+                attempt += 1
+                sleep(TransactionService._backoff(attempt))
+
+    @staticmethod
+    @transaction.atomic
+    def _execute_transfer(
+        sender_account_id: int,
+        to_account_number: str,
+        amount: Decimal,
+        transfer_operation_id: uuid.UUID,
+        store_result: bool = False,
+        optimistic: bool = False,
+    ) -> dict[str, Any]:
+        # Resolve the receiver and load both accounts in one statement. The
+        # optimistic mode takes no locks and checks the sender's version
+        # when debiting it instead
+        accounts = BankAccount.objects.filter(
+            Q(pk=sender_account_id) | Q(account_number=to_account_number)
+        )
+        if optimistic:
+            loaded_accounts = list(accounts)
+        else:
+            with metrics.timer("lock_wait"):
+                loaded_accounts = list(accounts.select_for_update().order_by("pk"))
+        sender = next(
+            (acc for acc in loaded_accounts if acc.pk == sender_account_id), None
         )
-        locked_map = {acc.pk: acc for acc in locked_accounts}
-        sender_locked = locked_map[sender_account.pk]
-        receiver_locked = locked_map[receiver_account.pk]
+        if sender is None:
+            raise ValueError("Account not found")
+
+        if sender.account_number == to_account_number:
+            raise ValueError("Cannot transfer to yourself")
+
+        receiver = next((acc for acc in loaded_accounts if acc.pk != sender.pk), None)
+        if receiver is None:
+            raise ValueError(f"Account {to_account_number} not found")
 
         # Calculate amounts
         fee = TransactionService.calculate_fee(amount)
         total_debit = round(amount + fee, 2)
 
-        if sender_locked.balance < total_debit:
+        if sender.balance < total_debit:
             raise ValueError(
                 f"Insufficient funds. Required: €{total_debit}, "
-                f"Available: €{sender_locked.balance}"
+                f"Available: €{sender.balance}"
             )
 
-        system_account = BankAccount.get_system_account()
+        [result] = TransactionService._commit_transfers(
+            sender,
+            [
+                PlannedTransfer(
+                    transfer_operation_id, receiver, amount, fee, store_result
+                )
+            ],
+            optimistic=optimistic,
+        )
+        return result
 
-        # Save balances BEFORE changes
-        sender_balance_before = sender_locked.balance
-        receiver_balance_before = receiver_locked.balance
-        system_balance_before = system_account.balance
+    @staticmethod
+    def execute_batch_transfer(
+        sender_account_id: int,
+        transfers: list[dict[str, Any]],
+        all_or_nothing: bool = False,
+    ) -> list[dict[str, Any]]:
+        operation_ids = [
+            item.get("transaction_id") or uuid.uuid4() for item in transfers
+        ]
 
-        BankAccount.objects.filter(pk=sender_locked.pk).update(
-            balance=F("balance") - total_debit
+        try:
+            return TransactionService._retry_transient(
+                "batch_transfer",
+                TransactionService._execute_batch_transfer,
+                sender_account_id,
+                transfers,
+                operation_ids,
+                all_or_nothing,
+            )
+        except IntegrityError:
+            # A concurrent request committed one of our keys first, the
+            # second pass answers or refuses it like any other booked key
+            return TransactionService._retry_transient(
+                "batch_transfer",
+                TransactionService._execute_batch_transfer,
+                sender_account_id,
+                transfers,
+                operation_ids,
+                all_or_nothing,
+            )
+
+    @staticmethod
+    @transaction.atomic
+    def _execute_batch_transfer(
+        sender_account_id: int,
+        transfers: list[dict[str, Any]],
+        operation_ids: list[uuid.UUID],
+        all_or_nothing: bool,
+    ) -> list[dict[str, Any]]:
+        results: list[dict[str, Any]] = [
+            {"index": index, "operation_id": str(operation_id)}
+            for index, operation_id in enumerate(operation_ids)
+        ]
+
+        client_keys = [
+            item["transaction_id"] for item in transfers if item.get("transaction_id")
+        ]
+        stored = dict(
+            IdempotencyRecord.objects.filter(
+                key__in=client_keys,
+                account_id=sender_account_id,
+                expires_at__gt=timezone.now(),
+            ).values_list("key", "response")
         )
-        BankAccount.objects.filter(pk=receiver_locked.pk).update(
-            balance=F("balance") + amount
+        # Keys of another sender, or whose record expired, were booked
+        # already and are refused like on the single transfer path
+        processed = set(
+            TransferOperation.objects.filter(
+                pk__in=[key for key in client_keys if key not in stored]
+            ).values_list("pk", flat=True)
         )
-        BankAccount.objects.filter(pk=system_account.pk).update(
-            balance=F("balance") + fee
+
+        # Lock the sender and every receiver at once, in pk order
+        with metrics.timer("lock_wait"):
+            locked_accounts = list(
+                BankAccount.objects.select_for_update()
+                .filter(
+                    Q(pk=sender_account_id)
+                    | Q(
+                        account_number__in={
+                            item["to_account_number"] for item in transfers
+                        }
+                    )
+                )
+                .order_by("pk")
+            )
+        sender_locked = next(
+            (acc for acc in locked_accounts if acc.pk == sender_account_id), None
         )
+        if sender_locked is None:
+            raise ValueError("Account not found")
+        receivers = {acc.account_number: acc for acc in locked_accounts}
 
-        sender_locked.refresh_from_db()
-        receiver_locked.refresh_from_db()
-        system_account.refresh_from_db()
-
-        receiver_txn_id = uuid.uuid4()
-        fee_txn_id = uuid.uuid4()
-
-        # Create transactions with metadata including balance snapshots
-        sender_txn = Transaction.objects.create(
-            transaction_id=transfer_operation_id,
-            account=sender_locked,
-            amount=total_debit,
-            transaction_type=Transaction.DEBIT,
-            description=f"Transfer to {to_account_number}",
-            metadata={
-                "operation": "transfer",
-                "operation_id": str(transfer_operation_id),
-                "receiver_txn_id": str(receiver_txn_id),
-                "fee_txn_id": str(fee_txn_id),
-                "role": "sender",
-                "counterparty_account": to_account_number,
-                "transfer_amount": str(amount),
-                "fee": str(fee),
-                "total_debited": str(Decimal(total_debit)),
-                "balance_before": str(sender_balance_before),
-                "balance_after": str(sender_locked.balance),
-            },
+        planned: list[PlannedTransfer] = []
+        planned_indexes: list[int] = []
+        seen_keys: set[uuid.UUID] = set()
+        available = sender_locked.balance
+
+        for index, item in enumerate(transfers):
+            operation_id = operation_ids[index]
+            to_account_number = item["to_account_number"]
+            amount = item["amount"]
+
+            if operation_id in stored:
+                results[index].update(status="duplicate", result=stored[operation_id])
+                continue
+
+            error = None
+            receiver = receivers.get(to_account_number)
+            if operation_id in processed:
+                error = f"Transaction {operation_id} was already processed"
+            elif operation_id in seen_keys:
+                error = f"Duplicate transaction_id in batch: {operation_id}"
+            elif amount <= 0:
+                error = "Transfer amount must be positive"
+            elif receiver is None:
+                error = f"Account {to_account_number} not found"
+            elif receiver.pk == sender_locked.pk:
+                error = "Cannot transfer to yourself"
+            seen_keys.add(operation_id)
+
+            if error is None:
+                assert receiver is not None
+                fee = TransactionService.calculate_fee(amount)
+                total_debit = round(amount + fee, 2)
+
+                if available < total_debit:
+                    error = (
+                        f"Insufficient funds. Required: €{total_debit}, "
+                        f"Available: €{available}"
+                    )
+                else:
+                    available -= total_debit
+                    planned.append(
+                        PlannedTransfer(
+                            operation_id,
+                            receiver,
+                            amount,
+                            fee,
+                            bool(item.get("transaction_id")),
+                        )
+                    )
+                    planned_indexes.append(index)
+
+            if error is not None:
+                results[index].update(status="failed", error=error)
+
+        if all_or_nothing and any(r.get("status") == "failed" for r in results):
+            for index in planned_indexes:
+                results[index].update(
+                    status="rejected", error="Batch rejected: another transfer failed"
+                )
+            return results
+
+        if planned:
+            committed = TransactionService._commit_transfers(sender_locked, planned)
+            for index, result in zip(planned_indexes, committed, strict=True):
+                results[index].update(status="completed", result=result)
+
+        logger.info(
+            f"Batch transfer from {sender_locked.account_number}: "
+            f"{len(planned)} of {len(transfers)} completed"
         )
 
-        receiver_txn = Transaction.objects.create(
-            transaction_id=receiver_txn_id,
-            account=receiver_locked,
-            amount=amount,
-            transaction_type=Transaction.CREDIT,
-            description=f"Transfer from {sender_locked.account_number}",
-            metadata={
-                "operation": "transfer",
-                "operation_id": str(transfer_operation_id),
-                "receiver_txn_id": str(receiver_txn_id),
-                "fee_txn_id": str(fee_txn_id),
-                "role": "receiver",
-                "counterparty_account": sender_locked.account_number,
-                "transfer_amount": str(amount),
-                "balance_before": str(receiver_balance_before),
-                "balance_after": str(receiver_locked.balance),
-            },
+        return results
+
+    @staticmethod
+    def _commit_transfers(
+        sender: BankAccount, planned: list[PlannedTransfer], optimistic: bool = False
+    ) -> list[dict[str, Any]]:
+        # Expects `sender` and every receiver to be locked, or with
+        # `optimistic` the sender's version to be the one it was read with;
+        # the system account is only touched here
+        system_account = BankAccount.get_system_account_ref()
+        total_fees = sum((plan.fee for plan in planned), Decimal("0.00"))
+        bucketed = settings.TRANSFER_FEE_MODE == "buckets"
+
+        deltas: dict[int, Decimal] = defaultdict(Decimal)
+        for plan in planned:
+            deltas[sender.pk] -= plan.amount + plan.fee
+            deltas[plan.receiver.pk] += plan.amount
+        if not bucketed:
+            deltas[system_account.pk] += total_fees
+
+        balances = TransactionService._apply_balance_deltas(
+            deltas, guarded=sender if optimistic else None
         )
 
-        fee_txn = Transaction.objects.create(
-            transaction_id=fee_txn_id,
-            account=system_account,
-            amount=fee,
-            transaction_type=Transaction.FEE,
-            description=f"Transfer fee: {sender_locked.account_number} to {to_account_number}",
-            metadata={
-                "operation": "transfer",
-                "operation_id": str(transfer_operation_id),
-                "receiver_txn_id": str(receiver_txn_id),
-                "fee_txn_id": str(fee_txn_id),
-                "role": "fee",
-                "sender_account": sender_locked.account_number,
-                "receiver_account": to_account_number,
-                "transfer_amount": str(amount),
-                "balance_before": str(system_balance_before),
-                "balance_after": str(system_account.balance),
-            },
+        if sender.pk not in balances:
+            raise TransferConflictError(
+                f"Account {sender.account_number} changed during the transfer"
+            )
+        if len(balances) != len(deltas):
+            # Only the cached system account can vanish under us
+            BankAccount.clear_system_account_ref()
+            raise ValueError("System account not found. Run migrations")
+
+        fee_bucket = None
+        if bucketed:
+            # Fees land in a striped bucket instead of the system account row,
+            # so transfers only contend on their own sender/receiver rows
+            fee_bucket = TransactionService._add_to_fee_bucket(sender.pk, total_fees)
+
+        BalanceCache.invalidate(balances)
+
+        # Balances before the batch, taken from the update itself since
+        # unlocked reads may be stale for the receivers
+        running = {pk: balances[pk] - delta for pk, delta in deltas.items()}
+
+        operations: list[TransferOperation] = []
+        rows: list[Transaction] = []
+        events: list[tuple[str, str, dict[str, Any]]] = []
+        results: list[dict[str, Any]] = []
+        records: list[IdempotencyRecord] = []
+        expires_at = timezone.now() + settings.IDEMPOTENCY_KEY_TTL
+
+        for plan in planned:
+            operation_id, receiver, amount, fee, _ = plan
+            total_debit = round(amount + fee, 2)
+            receiver_txn_id = uuid.uuid4()
+            fee_txn_id = uuid.uuid4()
+
+            sender_balance_before = running[sender.pk]
+            running[sender.pk] -= total_debit
+            running[receiver.pk] += amount
+
+            fee_balance_after = None
+            if fee_bucket is None:
+                running[system_account.pk] += fee
+                fee_balance_after = running[system_account.pk]
+
+            operations.append(
+                TransferOperation(
+                    id=operation_id,
+                    sender_id=sender.pk,
+                    receiver_id=receiver.pk,
+                    amount=amount,
+                    fee=fee,
+                    fee_bucket=fee_bucket,
+                    receiver_transaction_id=receiver_txn_id,
+                    fee_transaction_id=fee_txn_id,
+                )
+            )
+            rows += [
+                Transaction(
+                    transaction_id=operation_id,
+                    account=sender,
+                    amount=total_debit,
+                    transaction_type=Transaction.DEBIT,
+                    description=f"Transfer to {receiver.account_number}",
+                    operation_id=operation_id,
+                    counterparty_id=receiver.pk,
+                    balance_after=running[sender.pk],
+                ),
+                Transaction(
+                    transaction_id=receiver_txn_id,
+                    account=receiver,
+                    amount=amount,
+                    transaction_type=Transaction.CREDIT,
+                    description=f"Transfer from {sender.account_number}",
+                    operation_id=operation_id,
+                    counterparty_id=sender.pk,
+                    balance_after=running[receiver.pk],
+                ),
+                Transaction(
+                    transaction_id=fee_txn_id,
+                    account_id=system_account.pk,
+                    amount=fee,
+                    transaction_type=Transaction.FEE,
+                    description=f"Transfer fee: {sender.account_number} to {receiver.account_number}",
+                    operation_id=operation_id,
+                    counterparty_id=sender.pk,
+                    balance_after=fee_balance_after,
+                ),
+            ]
+
+            result = {
+                "operation_id": str(operation_id),
+                "sender_transaction_id": str(operation_id),
+                "receiver_transaction_id": str(receiver_txn_id),
+                "fee_transaction_id": str(fee_txn_id),
+                "amount": str(amount),
+                "fee": str(fee),
+                "total_debited": str(total_debit),
+                "sender_balance_before": str(sender_balance_before),
+                "sender_balance_after": str(running[sender.pk]),
+            }
+            results.append(result)
+            events.append(
+                (
+                    OutboxEvent.TRANSFER_COMPLETED,
+                    str(operation_id),
+                    {
+                        "operation_id": str(operation_id),
+                        "sender_account": sender.account_number,
+                        "receiver_account": receiver.account_number,
+                        "amount": str(amount),
+                        "fee": str(fee),
+                    },
+                )
+            )
+
+            if plan.store_result:
+                records.append(
+                    IdempotencyRecord(
+                        key=operation_id,
+                        account_id=sender.pk,
+                        response=result,
+                        expires_at=expires_at,
+                    )
+                )
+
+            logger.info(
+                "Transfer completed: %s → %s, amount: €%s, fee: €%s, operation_id: %s",
+                sender.account_number,
+                receiver.account_number,
+                amount,
+                fee,
+                operation_id,
+                extra={
+                    "sampled": True,
+                    "operation_id": str(operation_id),
+                    "account": sender.account_number,
+                    "receiver": receiver.account_number,
+                    "amount": str(amount),
+                    "fee": str(fee),
+                },
+            )
+
+        TransferOperation.objects.bulk_create(operations)
+        Transaction.objects.bulk_create(rows)
+        DailyBalanceService.record(rows)
+        OutboxService.record(events)
+        if records:
+            IdempotencyRecord.objects.bulk_create(records)
+
+        return results
+
+    @staticmethod
+    def _apply_balance_deltas(
+        deltas: dict[int, Decimal], guarded: BankAccount | None = None
+    ) -> dict[int, Decimal]:
+        # One UPDATE ... RETURNING for every touched account instead of
+        # an UPDATE plus refresh_from_db() per account. The `guarded` account
+        # is left out of the update, and the result, if its version moved on
+        # or the balance would go negative
+        values = ", ".join(["(%s, %s)"] * len(deltas))
+        params: list[Any] = [
+            value for pk, delta in sorted(deltas.items()) for value in (pk, delta)
+        ]
+        guard = ""
+        if guarded is not None:
+            guard = (
+                "AND (account.id <> %s OR (account.version = %s "
+                "AND account.balance + delta.amount >= 0)) "
+            )
+            params += [guarded.pk, guarded.version]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {BankAccount._meta.db_table} AS account "
+                "SET balance = account.balance + delta.amount, "
+                "version = account.version + 1, updated_at = now() "
+                f"FROM (VALUES {values}) AS delta(id, amount) "
+                f"WHERE account.id = delta.id {guard}"
+                "RETURNING account.id, account.balance",
+                params,
+            )
+            return dict(cursor.fetchall())
+
+    @staticmethod
+    def _add_to_fee_bucket(account_pk: int, fee: Decimal) -> int:
+        slot = account_pk % settings.TRANSFER_FEE_BUCKETS
+
+        if not FeeBucket.objects.filter(slot=slot).update(amount=F("amount") + fee):
+            FeeBucket.objects.get_or_create(slot=slot)
+            FeeBucket.objects.filter(slot=slot).update(amount=F("amount") + fee)
+
+        return slot
+
+    @staticmethod
+    @transaction.atomic
+    def rollup_fee_buckets() -> Decimal:
+        buckets = list(
+            FeeBucket.objects.select_for_update().filter(amount__gt=0).order_by("slot")
         )
+        total = sum((bucket.amount for bucket in buckets), Decimal("0.00"))
+
+        if not buckets:
+            return total
+
+        system_account = BankAccount.get_system_account()
+        BankAccount.objects.filter(pk=system_account.pk).update(
+            balance=F("balance") + total, version=F("version") + 1
+        )
+        FeeBucket.objects.filter(slot__in=[bucket.slot for bucket in buckets]).update(
+            amount=Decimal("0.00")
+        )
+        BalanceCache.invalidate([system_account.pk])
 
         logger.info(
-            f"Transfer completed: {sender_locked.account_number} → {to_account_number}, "
-            f"amount: €{amount}, fee: €{fee}, operation_id: {transfer_operation_id}"
+            f"Fee buckets rolled up: €{total} from {len(buckets)} buckets "
+            f"into {system_account.account_number}"
         )
 
-        return {
-            "operation_id": str(transfer_operation_id),
-            "sender_transaction_id": str(sender_txn.transaction_id),
-            "receiver_transaction_id": str(receiver_txn.transaction_id),
-            "fee_transaction_id": str(fee_txn.transaction_id),
-            "amount": str(amount),
-            "fee": str(fee),
-            "total_debited": str(total_debit),
-            "sender_balance_before": str(sender_balance_before),
-            "sender_balance_after": str(sender_locked.balance),
+        return total
+
+    @staticmethod
+    def purge_expired_idempotency_records(batch_size: int = 10000) -> int:
+        purged = 0
+
+        while True:
+            expired = IdempotencyRecord.objects.filter(
+                expires_at__lte=timezone.now()
+            ).values("pk")[:batch_size]
+            deleted, _ = IdempotencyRecord.objects.filter(pk__in=expired).delete()
+            purged += deleted
+
+            if deleted < batch_size:
+                return purged
+
+
+class DailyBalanceService:
+    MAX_STATEMENT_DAYS = 366
+    TOTAL_COLUMNS = {
+        Transaction.CREDIT: "credit_total",
+        Transaction.DEBIT: "debit_total",
+        Transaction.BONUS: "bonus_total",
+        Transaction.FEE: "fee_total",
+    }
+
+    @staticmethod
+    def record(rows: list[Transaction]) -> None:
+        # Folds freshly written ledger rows into today's rollups. `rows` must
+        # be in the order they were applied, with balance_after set, and the
+        # caller must hold the row lock of every account in them. Rows without
+        # balance_after (fees held in a bucket) are left to the catch-up job.
+        days: dict[tuple[int, date], dict[str, Any]] = {}
+        for row in rows:
+            if row.balance_after is None:
+                continue
+            signed = (
+                -row.amount if row.transaction_type == Transaction.DEBIT else row.amount
+            )
+            key = (row.account_id, timezone.localdate(row.created_at))
+            totals = days.setdefault(
+                key,
+                {
+                    "opening": row.balance_after - signed,
+                    "count": 0,
+                    **dict.fromkeys(DailyBalanceService.TOTAL_COLUMNS, Decimal("0")),
+                },
+            )
+            totals[row.transaction_type] += row.amount
+            totals["closing"] = row.balance_after
+            totals["count"] += 1
+
+        if not days:
+            return
+
+        columns = list(DailyBalanceService.TOTAL_COLUMNS.values())
+        values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(days))
+        params = [
+            value
+            for (account_pk, day), totals in sorted(days.items())
+            for value in (
+                account_pk,
+                day,
+                totals["opening"],
+                totals["closing"],
+                *(totals[kind] for kind in DailyBalanceService.TOTAL_COLUMNS),
+                totals["count"],
+            )
+        ]
+
+        # The opening balance is kept from the day's first write
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {DailyBalance._meta.db_table} AS d (
+                    account_id, day, opening_balance, closing_balance,
+                    {", ".join(columns)}, transaction_count
+                )
+                VALUES {values}
+                ON CONFLICT (account_id, day) DO UPDATE SET
+                    closing_balance = EXCLUDED.closing_balance,
+                    {", ".join(f"{c} = d.{c} + EXCLUDED.{c}" for c in columns)},
+                    transaction_count = d.transaction_count + EXCLUDED.transaction_count
+                """,
+                params,
+            )
+
+    @staticmethod
+    @transaction.atomic
+    def catch_up(since: date, until: date) -> int:
+        # Rebuilds the rollups of [since, until) from the ledger. Opening
+        # balances continue from the last rollup before `since`, or from the
+        # ledger for accounts without one.
+        start = timezone.make_aware(datetime.combine(since, time.min))
+        end = timezone.make_aware(datetime.combine(until, time.min))
+        signed = (
+            "CASE WHEN t.transaction_type = 'debit' THEN -t.amount ELSE t.amount END"
+        )
+        rollups = DailyBalance._meta.db_table
+        ledger = Transaction._meta.db_table
+        columns = DailyBalanceService.TOTAL_COLUMNS
+        totals = ", ".join(
+            f"coalesce(sum(t.amount) FILTER (WHERE t.transaction_type = '{kind}'), 0)"
+            f" AS {column}"
+            for kind, column in columns.items()
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {rollups} WHERE day >= %s AND day < %s", [since, until]
+            )
+            cursor.execute(
+                f"""
+                WITH daily AS (
+                    SELECT t.account_id,
+                           (t.created_at AT TIME ZONE %s)::date AS day,
+                           {totals},
+                           count(*) AS transaction_count,
+                           sum({signed}) AS net
+                    FROM {ledger} AS t
+                    WHERE t.created_at >= %s AND t.created_at < %s
+                    GROUP BY 1, 2
+                ),
+                base AS (
+                    SELECT a.account_id, coalesce(
+                        (SELECT p.closing_balance FROM {rollups} AS p
+                         WHERE p.account_id = a.account_id AND p.day < %s
+                         ORDER BY p.day DESC LIMIT 1),
+                        (SELECT sum({signed}) FROM {ledger} AS t
+                         WHERE t.account_id = a.account_id AND t.created_at < %s),
+                        0
+                    ) AS opening
+                    FROM (SELECT DISTINCT account_id FROM daily) AS a
+                )
+                INSERT INTO {rollups} (
+                    account_id, day, opening_balance, closing_balance,
+                    {", ".join(columns.values())}, transaction_count
+                )
+                SELECT daily.account_id, daily.day,
+                       base.opening + sum(daily.net) OVER running - daily.net,
+                       base.opening + sum(daily.net) OVER running,
+                       {", ".join(f"daily.{column}" for column in columns.values())},
+                       daily.transaction_count
+                FROM daily JOIN base ON base.account_id = daily.account_id
+                WINDOW running AS (PARTITION BY daily.account_id ORDER BY daily.day)
+                """,
+                [settings.TIME_ZONE, start, end, since, start],
+            )
+            rebuilt = cursor.rowcount
+
+        logger.info(f"Daily balances rebuilt from {since} to {until}: {rebuilt} rows")
+        return rebuilt
+
+    @staticmethod
+    def statement(
+        account_pk: int, from_date: date, to_date: date
+    ) -> list[dict[str, Any]]:
+        # Two index lookups whatever the range: the rollups in the range and
+        # the last one before it for the opening balance
+        rollups = {
+            rollup.day: rollup
+            for rollup in DailyBalance.objects.filter(
+                account_id=account_pk, day__range=(from_date, to_date)
+            )
         }
+        closing = (
+            DailyBalance.objects.filter(account_id=account_pk, day__lt=from_date)
+            .order_by("-day")
+            .values_list("closing_balance", flat=True)
+            .first()
+        ) or Decimal("0.00")
+
+        days = []
+        day = from_date
+        while day <= to_date:
+            rollup = rollups.get(day)
+            if rollup is None:
+                days.append(
+                    {
+                        "date": day,
+                        "opening_balance": closing,
+                        "closing_balance": closing,
+                        "credit": Decimal("0.00"),
+                        "debit": Decimal("0.00"),
+                        "bonus": Decimal("0.00"),
+                        "fee": Decimal("0.00"),
+                        "transaction_count": 0,
+                    }
+                )
+            else:
+                days.append(
+                    {
+                        "date": day,
+                        "opening_balance": rollup.opening_balance,
+                        "closing_balance": rollup.closing_balance,
+                        "credit": rollup.credit_total,
+                        "debit": rollup.debit_total,
+                        "bonus": rollup.bonus_total,
+                        "fee": rollup.fee_total,
+                        "transaction_count": rollup.transaction_count,
+                    }
+                )
+                closing = rollup.closing_balance
+            day += timedelta(days=1)
+
+        return days
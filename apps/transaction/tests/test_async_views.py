@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.account.models import BankAccount
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    def setup_method(self):
+        self.client = APIClient()
+        self.password = "testpass123"
+
+        self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        )
+        receiver = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "receiver@test.com", "password": self.password},
+            format="json",
+        )
+        self.receiver_account_number = receiver.data["account"]["account_number"]
+
+        token = self.client.post(
+            "/api/auth/login/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _transfer(self, amount):
+        return self.client.post(
+            "/api/transactions/transfer/async",
+            {"to_account_number": self.receiver_account_number, "amount": amount},
+            format="json",
+        )
+
+    def test_transfer(self):
+        response = self._transfer("100.00")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total_debited"] == "105.00"
+        receiver = BankAccount.objects.get(account_number=self.receiver_account_number)
+        assert receiver.balance == Decimal("10100.00")
+
+        balance = self.client.get("/api/auth/balance/async/").json()["balance"]
+        assert balance == "9895.00"
+
+    def test_transfer_errors(self):
+        response = self._transfer("20000.00")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Insufficient funds" in response.json()["error"]
+
+        response = self._transfer("-1")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "amount" in response.json()
+
+    def test_history_cursor_pages(self):
+        for _ in range(3):
+            assert self._transfer("10.00").status_code == status.HTTP_200_OK
+
+        first = self.client.get("/api/transactions/async", {"limit": 2}).json()
+        assert len(first["results"]) == 2
+        assert first["next"]
+
+        second = self.client.get(first["next"]).json()
+        seen = [t["transaction_id"] for t in first["results"] + second["results"]]
+        assert len(seen) == len(set(seen)) == 4
+        assert second["next"] is None
+
+    def test_history_validation(self):
+        response = self.client.get(
+            "/api/transactions/async", {"transaction_type": "nope"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = self.client.get("/api/transactions/async", {"cursor": "!!"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
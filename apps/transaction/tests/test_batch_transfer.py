@@ -0,0 +1,210 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.account.models import BankAccount, User
+from apps.transaction.models import IdempotencyRecord, Transaction
+from apps.transaction.services import TransactionService
+
+
+@pytest.mark.django_db
+class TestBatchTransfer:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/api/transactions/transfer/batch"
+
+        self.sender_email = "sender@test.com"
+        self.password = "testpass123"
+
+        self.receiver_account_numbers = []
+        for email in [self.sender_email, "receiver1@test.com", "receiver2@test.com"]:
+            response = self.client.post(
+                "/api/auth/sign_up/",
+                {"email": email, "password": self.password},
+                format="json",
+            )
+            assert response.status_code == 201
+            self.receiver_account_numbers.append(
+                response.data["account"]["account_number"]
+            )
+        self.sender_account_number = self.receiver_account_numbers.pop(0)
+
+        token = self.client.post(
+            "/api/auth/login/",
+            {"email": self.sender_email, "password": self.password},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _balance(self, account_number):
+        return BankAccount.objects.get(account_number=account_number).balance
+
+    def test_batch_reports_each_item(self):
+        first, second = self.receiver_account_numbers
+        data = {
+            "transfers": [
+                {"to_account_number": first, "amount": "100.00"},
+                {"to_account_number": "9999999999", "amount": "100.00"},
+                {"to_account_number": second, "amount": "1000.00"},
+                {"to_account_number": first, "amount": "999999.00"},
+            ]
+        }
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["completed"] == 2
+        assert response.data["failed"] == 2
+
+        statuses = [item["status"] for item in response.data["results"]]
+        assert statuses == ["completed", "failed", "completed", "failed"]
+        assert "not found" in response.data["results"][1]["error"]
+        assert "Insufficient funds" in response.data["results"][3]["error"]
+
+        third = response.data["results"][2]["result"]
+        assert third["sender_balance_before"] == "9895.00"
+        assert third["sender_balance_after"] == "8870.00"
+
+        assert self._balance(self.sender_account_number) == Decimal("8870.00")
+        assert self._balance(first) == Decimal("10100.00")
+        assert self._balance(second) == Decimal("11000.00")
+        assert Transaction.objects.filter(transaction_type=Transaction.FEE).count() == 2
+
+    def test_batch_all_or_nothing(self):
+        first, _ = self.receiver_account_numbers
+        data = {
+            "all_or_nothing": True,
+            "transfers": [
+                {"to_account_number": first, "amount": "100.00"},
+                {"to_account_number": self.sender_account_number, "amount": "1.00"},
+            ],
+        }
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        statuses = [item["status"] for item in response.data["results"]]
+        assert statuses == ["rejected", "failed"]
+        assert self._balance(self.sender_account_number) == Decimal("10000.00")
+
+    def test_batch_idempotency(self):
+        first, second = self.receiver_account_numbers
+        keys = [str(uuid.uuid4()), str(uuid.uuid4())]
+        data = {
+            "transfers": [
+                {
+                    "to_account_number": first,
+                    "amount": "10.00",
+                    "transaction_id": keys[0],
+                },
+                {
+                    "to_account_number": second,
+                    "amount": "20.00",
+                    "transaction_id": keys[1],
+                },
+            ]
+        }
+
+        response1 = self.client.post(self.url, data, format="json")
+        response2 = self.client.post(self.url, data, format="json")
+
+        assert response1.status_code == status.HTTP_200_OK
+        assert response2.status_code == status.HTTP_200_OK
+        assert [item["status"] for item in response2.data["results"]] == [
+            "duplicate",
+            "duplicate",
+        ]
+        assert [item["result"] for item in response1.data["results"]] == [
+            item["result"] for item in response2.data["results"]
+        ]
+        assert self._balance(self.sender_account_number) == Decimal("9960.00")
+
+    def test_batch_duplicate_key_within_batch(self):
+        first, second = self.receiver_account_numbers
+        key = str(uuid.uuid4())
+        data = {
+            "transfers": [
+                {"to_account_number": first, "amount": "10.00", "transaction_id": key},
+                {"to_account_number": second, "amount": "10.00", "transaction_id": key},
+            ]
+        }
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert [item["status"] for item in response.data["results"]] == [
+            "completed",
+            "failed",
+        ]
+
+    def test_batch_refuses_processed_key_without_record(self):
+        first, second = self.receiver_account_numbers
+        key = str(uuid.uuid4())
+        self.client.post(
+            self.url,
+            {
+                "transfers": [
+                    {
+                        "to_account_number": first,
+                        "amount": "10.00",
+                        "transaction_id": key,
+                    }
+                ]
+            },
+            format="json",
+        )
+        # The record expired, the operation is still in the ledger
+        IdempotencyRecord.objects.filter(key=key).delete()
+
+        response = self.client.post(
+            self.url,
+            {
+                "transfers": [
+                    {
+                        "to_account_number": first,
+                        "amount": "10.00",
+                        "transaction_id": key,
+                    },
+                    {"to_account_number": second, "amount": "20.00"},
+                ]
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["status"] for item in response.data["results"]] == [
+            "failed",
+            "completed",
+        ]
+        assert "already processed" in response.data["results"][0]["error"]
+        assert self._balance(self.sender_account_number) == Decimal("9960.00")
+
+    def test_batch_statement_count_is_constant(self, django_assert_max_num_queries):
+        sender_account = User.objects.get(email=self.sender_email).bank_account
+        first, second = self.receiver_account_numbers
+        transfers = [
+            {
+                "to_account_number": first if i % 2 else second,
+                "amount": Decimal("10.00"),
+                "transaction_id": uuid.uuid4(),
+            }
+            for i in range(50)
+        ]
+
+        # savepoint + idempotency lookup + processed keys lookup + lock
+        # + UPDATE ... RETURNING + operation insert + ledger insert
+        # + daily rollup upsert + outbox insert + idempotency insert + release
+        BankAccount.get_system_account_ref()
+        with django_assert_max_num_queries(11):
+            results = TransactionService.execute_batch_transfer(
+                sender_account_id=sender_account.pk, transfers=transfers
+            )
+
+        assert all(result["status"] == "completed" for result in results)
+
+    def test_batch_empty(self):
+        response = self.client.post(self.url, {"transfers": []}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
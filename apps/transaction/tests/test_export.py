@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestTransactionExport:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/api/transactions/export"
+
+        self.user_email = "testuser@test.com"
+        self.user_password = "testpass123"
+
+        sender_response = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": self.user_email, "password": self.user_password},
+            format="json",
+        )
+        assert sender_response.status_code == 201
+        self.account_number = sender_response.data["account"]["account_number"]
+
+        receiver_response = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "receiver@test.com", "password": self.user_password},
+            format="json",
+        )
+        assert receiver_response.status_code == 201
+        receiver_account_number = receiver_response.data["account"]["account_number"]
+
+        token = self.client.post(
+            "/api/auth/login/",
+            {"email": self.user_email, "password": self.user_password},
+            format="json",
+        ).data["access"]
+        self.client_authorization = f"Bearer {token}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.client_authorization)
+
+        for amount in ["100.00", "200.00", "50.00"]:
+            response = self.client.post(
+                "/api/transactions/transfer",
+                {"to_account_number": receiver_account_number, "amount": amount},
+                format="json",
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+    def _content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_csv(self):
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/csv"
+        assert self.account_number in response["Content-Disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        assert len(rows) == 4
+        assert [row["amount"] for row in rows[:3]] == ["55.00", "205.00", "105.00"]
+        assert rows[3]["transaction_type"] == "bonus"
+
+    def test_export_ndjson_with_filter(self):
+        response = self.client.get(
+            self.url, {"export_format": "ndjson", "transaction_type": "debit"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+
+        lines = self._content(response).splitlines()
+        assert len(lines) == 3
+        for line in lines:
+            assert json.loads(line)["transaction_type"] == "debit"
+
+    def test_export_streams_chunks_under_asgi(self):
+        # AsyncClient goes through the ASGI handler, which would load a sync
+        # stream into memory
+        async def export():
+            response = await AsyncClient().get(
+                self.url,
+                {"export_format": "ndjson"},
+                headers={"Authorization": self.client_authorization},
+            )
+            assert response.is_async
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        lines = async_to_sync(export)().decode().splitlines()
+
+        assert len(lines) == 4
+        assert json.loads(lines[0])["amount"] == "55.00"
+
+    def test_export_invalid_format(self):
+        response = self.client.get(self.url, {"export_format": "xlsx"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_invalid_filter(self):
+        response = self.client.get(self.url, {"from_date": "not-a-date"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_unauthenticated(self):
+        self.client.credentials()
+
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,86 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Sum
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.account.models import BankAccount
+from apps.transaction.models import FeeBucket, Transaction
+
+
+@pytest.mark.django_db
+class TestFeeBuckets:
+    @pytest.fixture(autouse=True)
+    def _fee_buckets_mode(self, settings):
+        settings.TRANSFER_FEE_MODE = "buckets"
+        settings.TRANSFER_FEE_BUCKETS = 4
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/api/transactions/transfer"
+
+        self.sender_email = "sender@test.com"
+        self.password = "testpass123"
+
+        sender_response = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": self.sender_email, "password": self.password},
+            format="json",
+        )
+        assert sender_response.status_code == 201
+
+        receiver_response = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "receiver@test.com", "password": self.password},
+            format="json",
+        )
+        assert receiver_response.status_code == 201
+        self.receiver_account_number = receiver_response.data["account"][
+            "account_number"
+        ]
+
+        token = self.client.post(
+            "/api/auth/login/",
+            {"email": self.sender_email, "password": self.password},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _transfer(self, amount):
+        response = self.client.post(
+            self.url,
+            {"to_account_number": self.receiver_account_number, "amount": amount},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return response
+
+    def test_fee_goes_to_bucket(self):
+        system_balance = BankAccount.get_system_account().balance
+
+        self._transfer("1000.00")
+
+        assert BankAccount.get_system_account().balance == system_balance
+        assert FeeBucket.objects.aggregate(total=Sum("amount"))["total"] == Decimal(
+            "25.00"
+        )
+
+        fee_txn = Transaction.objects.get(transaction_type=Transaction.FEE)
+        assert fee_txn.amount == Decimal("25.00")
+        assert fee_txn.operation.fee_bucket is not None
+        assert fee_txn.balance_after is None
+
+    def test_rollup_moves_fees_to_system_account(self):
+        system_balance = BankAccount.get_system_account().balance
+
+        self._transfer("100.00")
+        self._transfer("1000.00")
+
+        call_command("rollup_fees")
+
+        assert BankAccount.get_system_account().balance == system_balance + Decimal(
+            "30.00"
+        )
+        assert not FeeBucket.objects.filter(amount__gt=0).exists()
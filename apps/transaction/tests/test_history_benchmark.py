@@ -0,0 +1,86 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.transaction.models import Transaction
+
+
+@pytest.mark.django_db
+class TestHistoryBenchmark:
+    def test_seed_and_explain(self):
+        call_command("seed_ledger", accounts=5, transactions=200, stdout=StringIO())
+        assert Transaction.objects.count() == 200
+
+        out = StringIO()
+        call_command("explain_transaction_history", json=True, stdout=out)
+        plans = json.loads(out.getvalue())
+
+        assert set(plans) == {
+            "first_page",
+            "deep_page",
+            "type_filter",
+            "date_range",
+            "type_and_date_range",
+        }
+        for plan in plans.values():
+            assert plan["page"][0]["Plan"]
+            assert plan["count"][0]["Plan"]
+
+    def test_benchmark_reports_core_endpoints(self, settings, tmp_path):
+        settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+        output = tmp_path / "benchmark.json"
+
+        call_command(
+            "benchmark",
+            seed=True,
+            accounts=5,
+            transactions=100,
+            concurrency="1",
+            requests=4,
+            login_requests=2,
+            output=str(output),
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+        report = json.loads(output.read_text())
+
+        scenarios = {s["endpoint"]: s for s in report["scenarios"]}
+        assert set(scenarios) == {"transfer", "history", "balance", "login"}
+        for scenario in scenarios.values():
+            assert scenario["errors"] == 0
+            assert scenario["latency_ms"]["p50"] <= scenario["latency_ms"]["p99"]
+            assert scenario["queries_per_request"]["max"] > 0
+        assert scenarios["transfer"]["requests"] == 4
+        assert scenarios["login"]["requests"] == 2
+
+    def test_benchmark_fails_on_regression(self, settings, tmp_path):
+        settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(
+            json.dumps(
+                {
+                    "scenarios": [
+                        {
+                            "endpoint": "balance",
+                            "concurrency": 1,
+                            "latency_ms": {"p95": 0},
+                        }
+                    ]
+                }
+            )
+        )
+        call_command("seed_ledger", accounts=3, transactions=10, stdout=StringIO())
+
+        with pytest.raises(CommandError, match="balance x1"):
+            call_command(
+                "benchmark",
+                endpoints="balance",
+                concurrency="1",
+                requests=2,
+                baseline=str(baseline),
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
@@ -0,0 +1,108 @@
+import json
+import logging
+import threading
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from simplebank.log import JsonFormatter, QueueListenerHandler, SamplingFilter
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class TestQueueLogging:
+    def _logger(self, target, rate=1.0):
+        handler = QueueListenerHandler([target])
+        handler.addFilter(SamplingFilter(rate))
+        logger = logging.getLogger("apps.tests.queue_logging")
+        logger.handlers = [handler]
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        return logger, handler
+
+    def test_records_written_as_json_and_drained_on_close(self):
+        target = ListHandler()
+        target.setFormatter(JsonFormatter())
+        logger, handler = self._logger(target)
+
+        for index in range(100):
+            logger.info("Transfer %s", index, extra={"operation_id": f"op-{index}"})
+        handler.close()
+
+        assert len(target.lines) == 100
+        entry = json.loads(target.lines[-1])
+        assert entry["message"] == "Transfer 99"
+        assert entry["operation_id"] == "op-99"
+        assert entry["level"] == "INFO"
+
+    def test_sampling_only_drops_flagged_info(self):
+        target = ListHandler()
+        logger, handler = self._logger(target, rate=0.0)
+
+        logger.info("hot path", extra={"sampled": True})
+        logger.info("always kept")
+        logger.warning("hot path warning", extra={"sampled": True})
+        handler.close()
+
+        assert target.lines == ["always kept", "hot path warning"]
+
+    def test_arguments_formatted_only_for_kept_records_by_listener(self):
+        class Argument:
+            threads = []
+
+            def __str__(self):
+                self.threads.append(threading.get_ident())
+                return "argument"
+
+        target = ListHandler()
+        logger, handler = self._logger(target, rate=0.0)
+
+        logger.info("dropped %s", Argument(), extra={"sampled": True})
+        logger.info("kept %s", Argument())
+        handler.close()
+
+        assert target.lines == ["kept argument"]
+        [thread] = Argument.threads
+        assert thread != threading.get_ident()
+
+
+@pytest.mark.django_db
+class TestTransferLogging:
+    def test_transfer_log_is_structured(self, caplog):
+        client = APIClient()
+        for email in ("sender@test.com", "receiver@test.com"):
+            response = client.post(
+                "/api/auth/sign_up/",
+                {"email": email, "password": "testpass123"},
+                format="json",
+            )
+        receiver = response.data["account"]["account_number"]
+        token = client.post(
+            "/api/auth/login/",
+            {"email": "sender@test.com", "password": "testpass123"},
+            format="json",
+        ).data["access"]
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        with caplog.at_level(logging.INFO, logger="apps"):
+            response = client.post(
+                "/api/transactions/transfer",
+                {"to_account_number": receiver, "amount": "10.00"},
+                format="json",
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+        completed = next(
+            r for r in caplog.records if r.getMessage().startswith("Transfer completed")
+        )
+        assert completed.operation_id == response.data["operation_id"]
+        assert completed.receiver == receiver
+        assert completed.sampled is True
@@ -0,0 +1,111 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+def server_timing(response):
+    return {
+        name: dict(re.findall(r'(\w+)=("[^"]*"|[\d.]+)', params))
+        for name, params in (
+            entry.split(";", 1) for entry in response["Server-Timing"].split(", ")
+        )
+    }
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    def setup_method(self):
+        self.client = APIClient()
+        self.password = "testpass123"
+
+        self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        )
+        receiver = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "receiver@test.com", "password": self.password},
+            format="json",
+        )
+        self.receiver_account_number = receiver.data["account"]["account_number"]
+
+        token = self.client.post(
+            "/api/auth/login/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _transfer(self, url="/api/transactions/transfer"):
+        return self.client.post(
+            url,
+            {"to_account_number": self.receiver_account_number, "amount": "10.00"},
+            format="json",
+        )
+
+    def test_transfer_reports_server_timing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._transfer()
+
+        assert response.status_code == status.HTTP_200_OK
+        timing = server_timing(response)
+        assert timing["db"]["desc"] == f'"{len(queries)} queries"'
+        assert float(timing["lock"]["dur"]) > 0
+        assert float(timing["serialize"]["dur"]) > 0
+        assert float(timing["total"]["dur"]) >= float(timing["db"]["dur"])
+
+    def test_async_view_reports_server_timing(self):
+        response = self._transfer("/api/transactions/transfer/async")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert float(server_timing(response)["lock"]["dur"]) > 0
+
+    def test_server_timing_can_be_disabled(self, settings):
+        settings.SERVER_TIMING_ENABLED = False
+
+        response = self.client.get("/api/transactions/")
+
+        assert "Server-Timing" not in response
+
+    def test_metrics_endpoint_exposes_route_histograms(self, settings):
+        settings.METRICS_TOKEN = "scrape-token"
+        self._transfer()
+        self.client.get("/api/transactions/")
+
+        response = APIClient().get(
+            "/metrics", headers={"Authorization": "Bearer scrape-token"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = response.content.decode()
+        assert "# TYPE simplebank_http_request_duration_seconds histogram" in body
+        assert re.search(
+            r'simplebank_lock_wait_seconds_count\{route="api/transactions/transfer"\} \d+',
+            body,
+        )
+        assert re.search(
+            r"simplebank_db_queries_per_request_bucket"
+            r'\{route="api/transactions/",le="\+Inf"\} \d+',
+            body,
+        )
+        assert "simplebank_log_records_dropped_total" in body
+
+    def test_metrics_endpoint_rejects_a_missing_or_wrong_token(self, settings):
+        settings.METRICS_TOKEN = "scrape-token"
+        client = APIClient()
+
+        assert client.get("/metrics").status_code == status.HTTP_403_FORBIDDEN
+        response = client.get("/metrics", headers={"Authorization": "Bearer guess"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_metrics_endpoint_is_closed_without_a_token(self, settings):
+        settings.METRICS_TOKEN = ""
+        response = APIClient().get("/metrics", headers={"Authorization": "Bearer "})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
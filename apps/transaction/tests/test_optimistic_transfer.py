@@ -0,0 +1,132 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.account.models import BankAccount
+from apps.transaction.models import Transaction, TransferOperation
+from apps.transaction.services import TransactionService
+from simplebank import metrics
+
+
+@pytest.mark.django_db
+class TestOptimisticTransfer:
+    @pytest.fixture(autouse=True)
+    def _optimistic_mode(self, settings):
+        settings.TRANSFER_CONCURRENCY_MODE = "optimistic"
+        settings.TRANSFER_OPTIMISTIC_RETRIES = 2
+        settings.TRANSFER_RETRY_BACKOFF = 0.01
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/api/transactions/transfer"
+        self.password = "testpass123"
+
+        sender_response = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        )
+        self.sender_account_number = sender_response.data["account"]["account_number"]
+        receiver_response = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "receiver@test.com", "password": self.password},
+            format="json",
+        )
+        self.receiver_account_number = receiver_response.data["account"][
+            "account_number"
+        ]
+
+        token = self.client.post(
+            "/api/auth/login/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _transfer(self, amount="100.00"):
+        return self.client.post(
+            self.url,
+            {"to_account_number": self.receiver_account_number, "amount": amount},
+            format="json",
+        )
+
+    def _race_sender(self, monkeypatch, times):
+        # Another writer changes the sender between our read and our update
+        apply_balance_deltas = TransactionService._apply_balance_deltas
+        races = iter(range(times))
+
+        def racing_apply(deltas, guarded=None):
+            if guarded is not None and next(races, None) is not None:
+                BankAccount.objects.filter(pk=guarded.pk).update(
+                    version=F("version") + 1
+                )
+            return apply_balance_deltas(deltas, guarded)
+
+        monkeypatch.setattr(
+            TransactionService, "_apply_balance_deltas", staticmethod(racing_apply)
+        )
+
+    def _conflicts(self):
+        return metrics.TRANSFER_CONFLICTS._series.get((), 0)
+
+    def test_transfer_takes_no_row_locks(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._transfer()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["sender_balance_before"] == "10000.00"
+        assert response.data["sender_balance_after"] == "9895.00"
+        assert not any("FOR UPDATE" in query["sql"] for query in queries)
+
+        sender = BankAccount.objects.get(account_number=self.sender_account_number)
+        receiver = BankAccount.objects.get(account_number=self.receiver_account_number)
+        assert sender.balance == Decimal("9895.00")
+        assert sender.version == 1
+        assert receiver.balance == Decimal("10100.00")
+        assert receiver.version == 1
+
+    def test_conflict_is_retried(self, monkeypatch):
+        self._race_sender(monkeypatch, times=2)
+        conflicts = self._conflicts()
+        delays = []
+        monkeypatch.setattr("apps.transaction.services.sleep", delays.append)
+
+        response = self._transfer()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert self._conflicts() == conflicts + 2
+        # Jittered within 0..BACKOFF * 2^attempt before each retry
+        assert len(delays) == 2
+        assert 0 <= delays[0] <= 0.02 and 0 <= delays[1] <= 0.04
+        assert TransferOperation.objects.count() == 1
+        assert BankAccount.objects.get(
+            account_number=self.sender_account_number
+        ).balance == Decimal("9895.00")
+        debit = Transaction.objects.get(transaction_type=Transaction.DEBIT)
+        assert debit.balance_after == Decimal("9895.00")
+
+    def test_gives_up_after_retries(self, monkeypatch):
+        self._race_sender(monkeypatch, times=3)
+
+        response = self._transfer()
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert not TransferOperation.objects.exists()
+        assert BankAccount.objects.get(
+            account_number=self.sender_account_number
+        ).balance == Decimal("10000.00")
+
+    def test_guard_rejects_stale_version(self):
+        sender = BankAccount.objects.get(account_number=self.sender_account_number)
+        BankAccount.objects.filter(pk=sender.pk).update(version=F("version") + 1)
+
+        balances = TransactionService._apply_balance_deltas(
+            {sender.pk: Decimal("-1.00")}, guarded=sender
+        )
+
+        assert balances == {}
@@ -0,0 +1,152 @@
+import csv
+import gzip
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from apps.account.models import BankAccount
+from apps.transaction.checks import check_partitions
+from apps.transaction.filters import TransactionFilter
+from apps.transaction.models import Transaction
+from apps.transaction.partitions import add_months
+
+
+def partition_names():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits AS i
+            JOIN pg_class AS c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'transactions'::regclass
+            """
+        )
+        return {name for (name,) in cursor.fetchall()}
+
+
+def partition_of(description):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tableoid::regclass::text FROM transactions WHERE description = %s",
+            [description],
+        )
+        return cursor.fetchone()[0]
+
+
+def month_start(months_from_now):
+    now = timezone.now().astimezone(UTC)
+    return add_months(
+        now.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+        months_from_now,
+    )
+
+
+@pytest.mark.django_db
+class TestTransactionPartitions:
+    def test_creates_partitions_ahead(self):
+        call_command("manage_partitions", ahead=5, stdout=StringIO())
+
+        names = partition_names()
+        assert "transactions_legacy" in names
+        for months in range(1, 6):
+            assert f"transactions_p{month_start(months):%Y%m}" in names
+
+    def test_rows_past_the_last_partition_are_moved_out_of_default(self):
+        account = BankAccount.get_system_account()
+        Transaction.objects.create(
+            account=account,
+            amount="1.00",
+            transaction_type=Transaction.FEE,
+            description="Early fee",
+        )
+        late_month = month_start(5)
+        Transaction.objects.filter(description="Early fee").update(
+            created_at=late_month + timedelta(days=1)
+        )
+        assert partition_of("Early fee") == "transactions_default"
+
+        stdout = StringIO()
+        call_command("manage_partitions", ahead=5, stdout=stdout)
+
+        assert "Moved 1 rows from transactions_default" in stdout.getvalue()
+        assert partition_of("Early fee") == f"transactions_p{late_month:%Y%m}"
+
+    def test_check_warns_when_partitions_run_out(self, monkeypatch):
+        assert check_partitions(databases=["default"]) == []
+
+        future = add_months(timezone.now(), 3)
+        monkeypatch.setattr(timezone, "now", lambda: future)
+
+        [warning] = check_partitions(databases=["default"])
+        assert warning.id == "transaction.W001"
+
+    def test_date_range_only_scans_matching_partition(self):
+        call_command("manage_partitions", ahead=3, stdout=StringIO())
+        start = month_start(2)
+        filterset = TransactionFilter(
+            {
+                "from_date": start.isoformat(),
+                "to_date": (start + timedelta(days=10)).isoformat(),
+            },
+            queryset=Transaction.objects.filter(account_id=1),
+        )
+        assert filterset.is_valid()
+
+        plan = filterset.qs.order_by("-created_at", "-id")[:20].explain()
+
+        assert f"transactions_p{start:%Y%m}" in plan
+        assert "transactions_legacy" not in plan
+        assert f"transactions_p{month_start(3):%Y%m}" not in plan
+
+    def test_archives_partitions_past_retention(self, monkeypatch, tmp_path):
+        call_command("manage_partitions", ahead=2, stdout=StringIO())
+        archived_month = month_start(1)
+        account = BankAccount.get_system_account()
+        Transaction.objects.create(
+            account=account,
+            amount="1.00",
+            transaction_type=Transaction.FEE,
+            description="Archived fee",
+        )
+        Transaction.objects.filter(description="Archived fee").update(
+            created_at=archived_month + timedelta(days=1)
+        )
+        # The test transaction still holds deferred FK checks for that row,
+        # which would block dropping its partition
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        # Three months from now, keeping one month detaches everything up
+        # to and including next month
+        future = add_months(timezone.now(), 3)
+        monkeypatch.setattr(timezone, "now", lambda: future)
+        call_command(
+            "manage_partitions",
+            retain_months=1,
+            archive_dir=str(tmp_path),
+            stdout=StringIO(),
+        )
+
+        names = partition_names()
+        archived = f"transactions_p{archived_month:%Y%m}"
+        assert archived not in names
+        assert "transactions_legacy" not in names
+        assert f"transactions_p{month_start(2):%Y%m}" in names
+        with gzip.open(tmp_path / f"{archived}.csv.gz", "rt") as file:
+            rows = list(csv.DictReader(file))
+        assert [row["description"] for row in rows] == ["Archived fee"]
+        assert not Transaction.objects.filter(description="Archived fee").exists()
+
+    def test_add_months_clamps_to_month_end(self):
+        moment = datetime(2026, 11, 30, 12, tzinfo=UTC)
+
+        assert add_months(moment, 3) == datetime(2027, 2, 28, 12, tzinfo=UTC)
+        assert add_months(moment, -9) == datetime(2026, 2, 28, 12, tzinfo=UTC)
+        assert add_months(moment, 15) == datetime(2028, 2, 29, 12, tzinfo=UTC)
+
+    def test_archive_needs_retention(self):
+        with pytest.raises(Exception, match="--archive-dir needs --retain-months"):
+            call_command("manage_partitions", archive_dir="/tmp", stdout=StringIO())
@@ -0,0 +1,101 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from apps.account.models import BankAccount
+from apps.account.services import AccountService
+from apps.transaction.models import FeeBucket, Transaction
+from apps.transaction.partitions import add_months
+from apps.transaction.services import TransactionService
+
+
+def reconcile(**options):
+    stdout = StringIO()
+    call_command("reconcile_ledger", stdout=stdout, **options)
+    return stdout.getvalue()
+
+
+def make_ledger():
+    sender = AccountService.create_user_with_account("sender@test.com", "pass")
+    receiver = AccountService.create_user_with_account("receiver@test.com", "pass")
+    for amount in ["100.00", "1000.00"]:
+        TransactionService.execute_transfer(
+            sender["account"].pk,
+            receiver["account"].account_number,
+            Decimal(amount),
+        )
+    return sender["account"]
+
+
+@pytest.mark.django_db
+class TestReconcileLedger:
+    def test_clean_ledger_reconciles(self):
+        make_ledger()
+
+        output = reconcile(workers=1, chunk_size=1)
+
+        assert "Fees: €30.00 booked, €30.00 held" in output
+        assert "Checked 3 accounts and 8 ledger entries" in output
+        assert "0 mismatches" in output
+
+    def test_reports_drifted_balance(self):
+        sender = make_ledger()
+        BankAccount.objects.filter(pk=sender.pk).update(balance=F("balance") + 1)
+
+        stdout = StringIO()
+        with pytest.raises(CommandError, match="1 mismatches"):
+            call_command("reconcile_ledger", workers=1, stdout=stdout)
+
+        assert (
+            f"{sender.account_number}: balance €8871.00, ledger €8870.00, "
+            "difference €1.00" in stdout.getvalue()
+        )
+
+    def test_counts_fees_waiting_in_buckets(self, settings):
+        settings.TRANSFER_FEE_MODE = "buckets"
+        make_ledger()
+
+        output = reconcile(workers=1)
+
+        assert "€30.00 held by the system account (€30.00 of them" in output
+
+        FeeBucket.objects.update(amount=0)
+        with pytest.raises(CommandError, match="System account does not hold"):
+            reconcile(workers=1)
+
+    def test_archived_history_starts_from_daily_balances(self, monkeypatch, tmp_path):
+        make_ledger()
+        # Pending deferred FK checks of the test transaction would block
+        # dropping the archived partition
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        future = add_months(timezone.now(), 3)
+        monkeypatch.setattr(timezone, "now", lambda: future)
+        call_command(
+            "manage_partitions",
+            retain_months=1,
+            archive_dir=str(tmp_path),
+            stdout=StringIO(),
+        )
+        assert not Transaction.objects.exists()
+
+        output = reconcile(workers=1)
+
+        assert "Checked 3 accounts and 0 ledger entries" in output
+        assert "0 mismatches" in output
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+class TestReconcileLedgerWorkers:
+    def test_chunks_are_checked_in_parallel(self):
+        make_ledger()
+
+        output = reconcile(workers=2, chunk_size=1)
+
+        assert "Checked 3 accounts and 8 ledger entries" in output
+        assert "0 mismatches" in output
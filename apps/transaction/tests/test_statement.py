@@ -0,0 +1,144 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.account.models import BankAccount
+from apps.transaction.models import DailyBalance, Transaction
+
+
+@pytest.mark.django_db
+class TestDailyStatement:
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/api/transactions/statement"
+        self.password = "testpass123"
+
+        sender = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        )
+        self.sender_account_number = sender.data["account"]["account_number"]
+        receiver = self.client.post(
+            "/api/auth/sign_up/",
+            {"email": "receiver@test.com", "password": self.password},
+            format="json",
+        )
+        self.receiver_account_number = receiver.data["account"]["account_number"]
+
+        token = self.client.post(
+            "/api/auth/login/",
+            {"email": "sender@test.com", "password": self.password},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        for amount in ["100.00", "1000.00"]:
+            response = self.client.post(
+                "/api/transactions/transfer",
+                {"to_account_number": self.receiver_account_number, "amount": amount},
+                format="json",
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+    def _rollup(self, account_number):
+        return DailyBalance.objects.get(
+            account__account_number=account_number, day=timezone.localdate()
+        )
+
+    def test_transfers_update_todays_rollups(self):
+        sender = self._rollup(self.sender_account_number)
+        assert sender.opening_balance == Decimal("0.00")
+        assert sender.bonus_total == Decimal("10000.00")
+        assert sender.debit_total == Decimal("1130.00")  # 100 + 5, 1000 + 25
+        assert sender.closing_balance == Decimal("8870.00")
+        assert sender.transaction_count == 3
+
+        receiver = self._rollup(self.receiver_account_number)
+        assert receiver.credit_total == Decimal("1100.00")
+        assert receiver.closing_balance == Decimal("11100.00")
+
+        system = DailyBalance.objects.get(
+            account_id=BankAccount.get_system_account_ref().pk, day=timezone.localdate()
+        )
+        assert system.fee_total == Decimal("30.00")
+        assert system.closing_balance == BankAccount.get_system_account().balance
+
+    def test_statement_fills_days_without_activity(self):
+        today = timezone.localdate()
+
+        response = self.client.get(
+            self.url,
+            {
+                "from_date": str(today - timedelta(days=2)),
+                "to_date": str(today + timedelta(days=1)),
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["account_number"] == self.sender_account_number
+        days = response.data["days"]
+        assert [day["date"] for day in days] == [
+            str(today + timedelta(days=offset)) for offset in range(-2, 2)
+        ]
+        assert days[0]["closing_balance"] == "0.00"
+        assert days[2]["opening_balance"] == "0.00"
+        assert days[2]["bonus"] == "10000.00"
+        assert days[2]["debit"] == "1130.00"
+        assert days[2]["closing_balance"] == "8870.00"
+        assert days[3]["opening_balance"] == days[3]["closing_balance"] == "8870.00"
+        assert days[3]["transaction_count"] == 0
+
+    def test_statement_cost_does_not_grow_with_range(self):
+        today = timezone.localdate()
+
+        with CaptureQueriesContext(connection) as short_range:
+            self.client.get(self.url, {"from_date": str(today)})
+        with CaptureQueriesContext(connection) as long_range:
+            response = self.client.get(
+                self.url, {"from_date": str(today - timedelta(days=365))}
+            )
+
+        assert len(response.data["days"]) == 366
+        assert len(long_range) == len(short_range)
+
+    def test_statement_range_is_limited(self):
+        today = timezone.localdate()
+
+        response = self.client.get(
+            self.url, {"from_date": str(today - timedelta(days=366))}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_catch_up_rebuilds_past_days_from_ledger(self):
+        # Move the whole history to yesterday, as a bulk load would leave it
+        yesterday = timezone.localdate() - timedelta(days=1)
+        Transaction.objects.update(created_at=timezone.now() - timedelta(days=1))
+        expected = {rollup.account_id: rollup for rollup in DailyBalance.objects.all()}
+        DailyBalance.objects.all().delete()
+
+        call_command("rollup_daily_balances", stdout=StringIO())
+
+        rebuilt = {rollup.account_id: rollup for rollup in DailyBalance.objects.all()}
+        assert set(rebuilt) == set(expected)
+        for account_pk, rollup in rebuilt.items():
+            assert rollup.day == yesterday
+            for field in [
+                "opening_balance",
+                "closing_balance",
+                "credit_total",
+                "debit_total",
+                "bonus_total",
+                "fee_total",
+                "transaction_count",
+            ]:
+                assert getattr(rollup, field) == getattr(expected[account_pk], field)
@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -81,6 +83,53 @@ class TestTransactionList:
         assert "created_at" in first_transaction
         assert "metadata" in first_transaction
 
+    def test_transfer_metadata_is_built_from_operation(self):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        results = self.client.get(self.url).data["results"]
+
+        latest, previous, bonus = results[0], results[1], results[-1]
+        assert latest["metadata"] == {
+            "operation": "transfer",
+            "operation_id": latest["transaction_id"],
+            "receiver_txn_id": latest["metadata"]["receiver_txn_id"],
+            "fee_txn_id": latest["metadata"]["fee_txn_id"],
+            "role": "sender",
+            "counterparty_account": self.receiver_account_number,
+            "transfer_amount": "75.00",
+            "fee": "5.00",
+            "total_debited": "80.00",
+            "balance_before": previous["metadata"]["balance_after"],
+            "balance_after": latest["metadata"]["balance_after"],
+        }
+        assert bonus["transaction_type"] == "bonus"
+        assert bonus["metadata"] == {}
+
+        receiver_token = self.client.post(
+            "/api/auth/login/",
+            {"email": self.receiver_email, "password": self.receiver_password},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {receiver_token}")
+        credit = self.client.get(self.url).data["results"][0]
+
+        assert credit["transaction_id"] == latest["metadata"]["receiver_txn_id"]
+        assert credit["metadata"]["role"] == "receiver"
+        assert credit["metadata"]["operation_id"] == latest["transaction_id"]
+        assert credit["metadata"]["counterparty_account"] == self.account_number
+
+    def test_metadata_does_not_add_queries_per_row(self):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(self.url, {"limit": "1"})
+        with CaptureQueriesContext(connection) as full_page:
+            self.client.get(self.url, {"limit": "6"})
+
+        assert len(full_page) == len(small_page)
+
     def test_get_transactions_unauthenticated(self):
         response = self.client.get(self.url)
 
@@ -182,3 +231,52 @@ class TestTransactionList:
 
         for transaction in response.data["results"]:
             assert transaction["transaction_type"] == "debit"
+
+    def test_transactions_cursor_pagination(self):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        seen_ids = []
+        params = {"pagination": "cursor", "limit": "4"}
+        response = self.client.get(self.url, params)
+
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.data
+            seen_ids.extend(t["transaction_id"] for t in response.data["results"])
+
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+
+        assert len(seen_ids) == 6
+        assert len(set(seen_ids)) == 6
+
+    def test_transactions_cursor_pagination_with_filter(self):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get(
+            self.url,
+            {"pagination": "cursor", "limit": "3", "transaction_type": "debit"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 3
+
+        next_page = self.client.get(response.data["next"])
+        assert next_page.status_code == status.HTTP_200_OK
+        assert len(next_page.data["results"]) == 2
+        assert next_page.data["next"] is None
+
+        for transaction in response.data["results"] + next_page.data["results"]:
+            assert transaction["transaction_type"] == "debit"
+
+    def test_transactions_invalid_cursor(self):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get(
+            self.url, {"pagination": "cursor", "cursor": "not-a-cursor"}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
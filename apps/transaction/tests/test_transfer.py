@@ -1,9 +1,17 @@
+import uuid
+from datetime import timedelta
 from decimal import Decimal
 
 import pytest
+from django.core.management import call_command
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from apps.account.models import BankAccount, User
+from apps.transaction.models import IdempotencyRecord, Transaction, TransferOperation
+from apps.transaction.services import TransactionService
+
 
 @pytest.mark.django_db
 class TestTransfer:
@@ -100,6 +108,24 @@ class TestTransfer:
         assert "error" in response.data
         assert "not found" in response.data["error"]
 
+    def test_transfer_from_deleted_account(self):
+        token = self._get_auth_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        # The token still carries the account id
+        BankAccount.objects.filter(user__email=self.sender_email).delete()
+
+        data = {"to_account_number": self.receiver_account_number, "amount": "10.00"}
+
+        response = self.client.post(self.url, data, format="json")
+        batch_response = self.client.post(
+            f"{self.url}/batch", {"transfers": [data]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error"] == "Account not found"
+        assert batch_response.status_code == status.HTTP_400_BAD_REQUEST
+        assert batch_response.data["error"] == "Account not found"
+
     def test_transfer_to_yourself(self):
         token = self._get_auth_token()
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
@@ -143,8 +169,6 @@ class TestTransfer:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
     def test_transfer_idempotency(self):
-        import uuid
-
         token = self._get_auth_token()
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
 
@@ -179,3 +203,83 @@ class TestTransfer:
 
         expected_balance = Decimal(balance_before) - Decimal("105.00")  # 100 + 5 fee
         assert Decimal(balance_after) == expected_balance
+
+    def test_transfer_statement_count(self, django_assert_max_num_queries):
+        sender_account = User.objects.get(email=self.sender_email).bank_account
+
+        # savepoint + lock + UPDATE ... RETURNING + operation insert
+        # + ledger insert + daily rollup upsert + outbox insert + release
+        BankAccount.get_system_account_ref()
+        with django_assert_max_num_queries(8):
+            TransactionService.execute_transfer(
+                sender_account_id=sender_account.pk,
+                to_account_number=self.receiver_account_number,
+                amount=Decimal("100.00"),
+            )
+
+    def test_transfer_retry_is_single_lookup(self, django_assert_num_queries):
+        sender_account = User.objects.get(email=self.sender_email).bank_account
+        transaction_id = uuid.uuid4()
+
+        first = TransactionService.execute_transfer(
+            sender_account_id=sender_account.pk,
+            to_account_number=self.receiver_account_number,
+            amount=Decimal("100.00"),
+            transaction_id=transaction_id,
+        )
+
+        with django_assert_num_queries(1):
+            retry = TransactionService.execute_transfer(
+                sender_account_id=sender_account.pk,
+                to_account_number=self.receiver_account_number,
+                amount=Decimal("100.00"),
+                transaction_id=transaction_id,
+            )
+
+        assert retry == first
+
+    def test_purge_expired_idempotency_records(self):
+        sender_account = User.objects.get(email=self.sender_email).bank_account
+        expired_id, live_id = uuid.uuid4(), uuid.uuid4()
+
+        for transaction_id in (expired_id, live_id):
+            TransactionService.execute_transfer(
+                sender_account_id=sender_account.pk,
+                to_account_number=self.receiver_account_number,
+                amount=Decimal("10.00"),
+                transaction_id=transaction_id,
+            )
+        IdempotencyRecord.objects.filter(key=expired_id).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        call_command("purge_idempotency_keys")
+
+        assert list(IdempotencyRecord.objects.values_list("key", flat=True)) == [
+            live_id
+        ]
+
+    def test_deleting_a_user_keeps_the_counterparty_ledger(self):
+        sender = User.objects.get(email=self.sender_email)
+        receiver_account = BankAccount.objects.get(
+            account_number=self.receiver_account_number
+        )
+        TransactionService.execute_transfer(
+            sender_account_id=sender.bank_account.pk,
+            to_account_number=self.receiver_account_number,
+            amount=Decimal("100.00"),
+            transaction_id=uuid.uuid4(),
+        )
+
+        sender.delete()
+
+        assert not TransferOperation.objects.exists()
+        credit = Transaction.objects.get(
+            account=receiver_account, transaction_type=Transaction.CREDIT
+        )
+        assert credit.amount == Decimal("100.00")
+        assert credit.balance_after == Decimal("10100.00")
+        assert credit.operation_id is None
+        assert credit.counterparty_id is None
+        receiver_account.refresh_from_db()
+        assert receiver_account.balance == Decimal("10100.00")
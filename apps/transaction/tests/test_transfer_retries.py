@@ -0,0 +1,150 @@
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.db import OperationalError, connection, transaction
+
+from apps.account.models import BankAccount
+from apps.account.services import AccountService
+from apps.transaction.models import TransferOperation
+from apps.transaction.services import TransactionService
+from simplebank import metrics
+
+
+def retries(reason):
+    return metrics.DB_RETRIES._series.get(
+        (("operation", "transfer"), ("reason", reason)), 0
+    )
+
+
+def wait_for_lock_waiter(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    with connection.cursor() as cursor:
+        while time.monotonic() < deadline:
+            cursor.execute(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE wait_event_type = 'Lock' AND pid <> pg_backend_pid()"
+            )
+            if cursor.fetchone()[0]:
+                return
+            time.sleep(0.01)
+    raise AssertionError("Nobody waited for the lock")
+
+
+# Transfers have to own their transaction to be retried, so these tests run
+# outside the per-test transaction, with a second connection per thread
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+class TestTransferRetries:
+    @pytest.fixture(autouse=True)
+    def _retry_settings(self, settings):
+        settings.TRANSFER_RETRY_ATTEMPTS = 10
+        settings.TRANSFER_RETRY_BACKOFF = 0.01
+
+    def setup_method(self):
+        self.sender = AccountService.create_user_with_account(
+            "sender@test.com", "testpass123"
+        )["account"]
+        self.receiver = AccountService.create_user_with_account(
+            "receiver@test.com", "testpass123"
+        )["account"]
+        assert self.sender.pk < self.receiver.pk
+        self.operation_id = uuid.uuid4()
+
+    def _in_thread(self, target):
+        errors = []
+
+        def run():
+            try:
+                target()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread, errors
+
+    def _transfer(self):
+        return TransactionService.execute_transfer(
+            self.sender.pk,
+            self.receiver.account_number,
+            Decimal("100.00"),
+            self.operation_id,
+        )
+
+    def _assert_booked_once(self):
+        assert TransferOperation.objects.filter(pk=self.operation_id).count() == 1
+        assert BankAccount.objects.get(pk=self.sender.pk).balance == Decimal("9895.00")
+
+    def test_deadlock_is_retried(self):
+        locked = threading.Event()
+
+        def lock_receiver_then_sender():
+            # Locks in the opposite order of the transfer, which holds the
+            # sender and waits for the receiver
+            with transaction.atomic():
+                BankAccount.objects.select_for_update().get(pk=self.receiver.pk)
+                locked.set()
+                wait_for_lock_waiter()
+                BankAccount.objects.select_for_update().get(pk=self.sender.pk)
+
+        deadlocks = retries("deadlock")
+        thread, errors = self._in_thread(lock_receiver_then_sender)
+        assert locked.wait(5)
+
+        result = self._transfer()
+        thread.join()
+
+        assert errors == []
+        assert result["operation_id"] == str(self.operation_id)
+        assert retries("deadlock") == deadlocks + 1
+        self._assert_booked_once()
+
+    def _hold_sender_lock(self, seconds):
+        locked = threading.Event()
+
+        def hold():
+            with transaction.atomic():
+                BankAccount.objects.select_for_update().get(pk=self.sender.pk)
+                locked.set()
+                time.sleep(seconds)
+
+        thread, errors = self._in_thread(hold)
+        assert locked.wait(5)
+        return thread, errors
+
+    def test_lock_timeout_is_retried(self):
+        lock_timeouts = retries("lock_timeout")
+        thread, errors = self._hold_sender_lock(0.3)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET lock_timeout = '50ms'")
+            try:
+                result = self._transfer()
+            finally:
+                cursor.execute("RESET lock_timeout")
+        thread.join()
+
+        assert errors == []
+        assert result["operation_id"] == str(self.operation_id)
+        assert retries("lock_timeout") > lock_timeouts
+        self._assert_booked_once()
+
+    def test_not_retried_inside_callers_transaction(self):
+        lock_timeouts = retries("lock_timeout")
+        thread, _ = self._hold_sender_lock(0.3)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET lock_timeout = '50ms'")
+            try:
+                with pytest.raises(OperationalError), transaction.atomic():
+                    self._transfer()
+            finally:
+                cursor.execute("RESET lock_timeout")
+        thread.join()
+
+        assert retries("lock_timeout") == lock_timeouts
+        assert not TransferOperation.objects.exists()
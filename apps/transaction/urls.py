@@ -1,8 +1,21 @@
 from django.urls import path
 
-from .views import TransactionListView, TransferView
+from .views import (
+    AsyncTransactionListView,
+    AsyncTransferView,
+    BatchTransferView,
+    StatementView,
+    TransactionExportView,
+    TransactionListView,
+    TransferView,
+)
 
 urlpatterns = [
     path("", TransactionListView.as_view(), name="transaction_list"),
+    path("async", AsyncTransactionListView.as_view(), name="transaction_list_async"),
+    path("export", TransactionExportView.as_view(), name="transaction_export"),
+    path("statement", StatementView.as_view(), name="statement"),
     path("transfer", TransferView.as_view(), name="transfer"),
+    path("transfer/async", AsyncTransferView.as_view(), name="transfer_async"),
+    path("transfer/batch", BatchTransferView.as_view(), name="transfer_batch"),
 ]
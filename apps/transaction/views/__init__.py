@@ -1,4 +1,14 @@
-from .transaction_views import TransactionListView
-from .transfer_views import TransferView
+from .export_views import TransactionExportView
+from .statement_views import StatementView
+from .transaction_views import AsyncTransactionListView, TransactionListView
+from .transfer_views import AsyncTransferView, BatchTransferView, TransferView
 
-__all__ = ["TransactionListView", "TransferView"]
+__all__ = [
+    "TransactionListView",
+    "AsyncTransactionListView",
+    "TransactionExportView",
+    "StatementView",
+    "TransferView",
+    "AsyncTransferView",
+    "BatchTransferView",
+]
@@ -0,0 +1,71 @@
+import logging
+from typing import cast
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.account.authentication import AccountTokenUser
+
+from ..serializers import StatementQuerySerializer, StatementSerializer
+from ..services import DailyBalanceService
+
+logger = logging.getLogger(__name__)
+
+
+class StatementView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        tags=["Transactions"],
+        summary="Daily statement",
+        description=(
+            "Opening and closing balance with credit, debit, bonus and fee "
+            "totals for every day of the range, read from the daily rollups."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="from_date",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description="First day (optional, default: 29 days before to_date)",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="to_date",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description="Last day (optional, default: today)",
+                required=False,
+            ),
+        ],
+        responses={200: StatementSerializer},
+    )
+    def get(self, request: Request) -> Response:
+        user = cast(AccountTokenUser, request.user)
+
+        query = StatementQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        from_date = query.validated_data["from_date"]
+        to_date = query.validated_data["to_date"]
+
+        days = DailyBalanceService.statement(user.account_id, from_date, to_date)
+
+        logger.info(
+            f"Daily statement for account {user.account_number}: "
+            f"{from_date} to {to_date}"
+        )
+
+        serializer = StatementSerializer(
+            {
+                "account_number": user.account_number,
+                "from_date": from_date,
+                "to_date": to_date,
+                "days": days,
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
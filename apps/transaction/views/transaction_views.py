@@ -1,14 +1,27 @@
 import logging
 from typing import cast
 
+from django.http import HttpRequest, JsonResponse
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.exceptions import APIException
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
 
-from apps.account.models import User
+from apps.account.authentication import (
+    AccountTokenUser,
+    AsyncAPIView,
+    api_error_response,
+)
+from simplebank import metrics
 
-from ..filters import TransactionFilter, TransactionPagination
+from ..filters import (
+    TransactionCursorPagination,
+    TransactionFilter,
+    TransactionPagination,
+)
 from ..models import Transaction
 from ..serializers import TransactionSerializer
 
@@ -20,6 +33,7 @@ class TransactionListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     filterset_class = TransactionFilter
     pagination_class = TransactionPagination
+    _paginator: BasePagination
 
     @extend_schema(
         tags=["Transactions"],
@@ -53,6 +67,24 @@ class TransactionListView(generics.ListAPIView):
                 description="Page number (optional, default: 1)",
                 required=False,
             ),
+            OpenApiParameter(
+                name="pagination",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Use 'cursor' for keyset pagination: no total count, "
+                    "constant cost per page (optional, default: page)"
+                ),
+                required=False,
+                enum=["page", "cursor"],
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Cursor from the 'next' link (cursor pagination only)",
+                required=False,
+            ),
             OpenApiParameter(
                 name="limit",
                 type=OpenApiTypes.INT,
@@ -65,6 +97,53 @@ class TransactionListView(generics.ListAPIView):
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        with metrics.timer("serialization"):
+            data = self.get_serializer(page, many=True).data
+        return self.get_paginated_response(data)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = TransactionCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
-        user = cast(User, self.request.user)
-        return Transaction.objects.filter(account=user.bank_account)
+        user = cast(AccountTokenUser, self.request.user)
+        return Transaction.objects.filter(account_id=user.account_id).select_related(
+            "operation__sender", "operation__receiver"
+        )
+
+
+class AsyncTransactionListView(AsyncAPIView):
+    # Keyset pages only: a page-number COUNT(*) would dominate the request
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        user = cast(AccountTokenUser, request.user)
+
+        filterset = TransactionFilter(
+            request.GET,
+            queryset=Transaction.objects.filter(
+                account_id=user.account_id
+            ).select_related("operation__sender", "operation__receiver"),
+        )
+        if not filterset.is_valid():
+            return JsonResponse(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = TransactionCursorPagination()
+        try:
+            page = await paginator.apaginate_queryset(filterset.qs, Request(request))
+        except APIException as e:
+            return api_error_response(e)
+
+        with metrics.timer("serialization"):
+            return JsonResponse(
+                {
+                    "next": paginator.get_next_link(),
+                    "results": TransactionSerializer(page, many=True).data,
+                },
+                status=status.HTTP_200_OK,
+            )
@@ -1,6 +1,9 @@
+import json
 import logging
 from typing import cast
 
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, JsonResponse
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -8,10 +11,15 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.account.models import User
+from apps.account.authentication import AccountTokenUser, AsyncAPIView
 
-from ..serializers import TransferResponseSerializer, TransferSerializer
-from ..services import TransactionService
+from ..serializers import (
+    BatchTransferResponseSerializer,
+    BatchTransferSerializer,
+    TransferResponseSerializer,
+    TransferSerializer,
+)
+from ..services import TransactionService, TransferConflictError
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +34,7 @@ class TransferView(APIView):
         responses={
             200: TransferResponseSerializer,
             400: {"type": "object", "properties": {"error": {"type": "string"}}},
+            409: {"type": "object", "properties": {"error": {"type": "string"}}},
         },
         summary="Transfer money to another account",
         description=(
@@ -34,7 +43,7 @@ class TransferView(APIView):
         ),
     )
     def post(self, request: Request, *args, **kwargs) -> Response:
-        user = cast(User, request.user)
+        user = cast(AccountTokenUser, request.user)
 
         serializer = TransferSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -44,28 +53,54 @@ class TransferView(APIView):
         transaction_id = serializer.validated_data.get("transaction_id")
 
         logger.info(
-            f"Transfer request from user {user.email}: "
-            f"to={to_account}, amount=€{amount}"
+            "Transfer request from user %s: to=%s, amount=€%s",
+            user.email,
+            to_account,
+            amount,
+            extra={
+                "sampled": True,
+                "account": user.account_number,
+                "receiver": to_account,
+                "amount": str(amount),
+            },
         )
 
         try:
             result = TransactionService.execute_transfer(
-                sender_account=user.bank_account,
+                sender_account_id=user.account_id,
                 to_account_number=to_account,
                 amount=amount,
                 transaction_id=transaction_id,
             )
 
             logger.info(
-                f"Transfer successful: operation_id={result['operation_id']}, "
-                f"user={user.email}"
+                "Transfer successful: operation_id=%s, user=%s",
+                result["operation_id"],
+                user.email,
+                extra={
+                    "sampled": True,
+                    "operation_id": result["operation_id"],
+                    "account": user.account_number,
+                },
             )
 
             return Response(result, status=status.HTTP_200_OK)
 
         except ValueError as e:
-            logger.warning(f"Transfer failed for user {user.email}: {str(e)}")
+            logger.warning(
+                f"Transfer failed for user {user.email}: {str(e)}",
+                extra={"account": user.account_number},
+            )
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except TransferConflictError:
+            logger.warning(
+                f"Transfer conflicted for user {user.email}",
+                extra={"account": user.account_number},
+            )
+            return Response(
+                {"error": "Account is busy. Please retry the transfer."},
+                status=status.HTTP_409_CONFLICT,
+            )
         except Exception as e:
             logger.error(
                 f"Unexpected error during transfer for user {user.email}: {str(e)}",
@@ -75,3 +110,157 @@ class TransferView(APIView):
                 {"error": "Transfer failed. Please try again later."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class BatchTransferView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = BatchTransferSerializer
+
+    @extend_schema(
+        tags=["Transactions"],
+        request=BatchTransferSerializer,
+        responses={
+            200: BatchTransferResponseSerializer,
+            400: BatchTransferResponseSerializer,
+        },
+        summary="Execute many transfers in one request",
+        description=(
+            "Execute up to 1000 transfers from the authenticated user's account "
+            "in a single database transaction. Each transfer may carry its own "
+            "transaction_id for idempotency. Failed transfers are reported per "
+            "item and do not affect the others, unless all_or_nothing is set, "
+            "in which case nothing is executed and the response is 400."
+        ),
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        user = cast(AccountTokenUser, request.user)
+
+        serializer = BatchTransferSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        transfers = serializer.validated_data["transfers"]
+        all_or_nothing = serializer.validated_data["all_or_nothing"]
+
+        logger.info(
+            f"Batch transfer request from user {user.email}: "
+            f"{len(transfers)} transfers, all_or_nothing={all_or_nothing}",
+            extra={"account": user.account_number},
+        )
+
+        try:
+            results = TransactionService.execute_batch_transfer(
+                sender_account_id=user.account_id,
+                transfers=transfers,
+                all_or_nothing=all_or_nothing,
+            )
+        except ValueError as e:
+            logger.warning(
+                f"Batch transfer failed for user {user.email}: {str(e)}",
+                extra={"account": user.account_number},
+            )
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(
+                f"Unexpected error during batch transfer for user {user.email}: "
+                f"{str(e)}",
+                exc_info=True,
+            )
+            return Response(
+                {"error": "Transfer failed. Please try again later."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        failed = sum(1 for result in results if result["status"] == "failed")
+        rejected = all_or_nothing and failed > 0
+
+        return Response(
+            {
+                "completed": sum(
+                    1 for result in results if result["status"] == "completed"
+                ),
+                "failed": failed,
+                "results": results,
+            },
+            status=status.HTTP_400_BAD_REQUEST if rejected else status.HTTP_200_OK,
+        )
+
+
+class AsyncTransferView(AsyncAPIView):
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        user = cast(AccountTokenUser, request.user)
+
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse(
+                {"detail": "JSON parse error"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = TransferSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        to_account = serializer.validated_data["to_account_number"]
+        amount = serializer.validated_data["amount"]
+        transaction_id = serializer.validated_data.get("transaction_id")
+
+        logger.info(
+            "Transfer request from user %s: to=%s, amount=€%s",
+            user.email,
+            to_account,
+            amount,
+            extra={
+                "sampled": True,
+                "account": user.account_number,
+                "receiver": to_account,
+                "amount": str(amount),
+            },
+        )
+
+        try:
+            # The ORM cannot run transactions from async code, so the whole
+            # atomic, row-locking transfer runs as one unit on the ORM's thread
+            result = await sync_to_async(TransactionService.execute_transfer)(
+                sender_account_id=user.account_id,
+                to_account_number=to_account,
+                amount=amount,
+                transaction_id=transaction_id,
+            )
+
+            logger.info(
+                "Transfer successful: operation_id=%s, user=%s",
+                result["operation_id"],
+                user.email,
+                extra={
+                    "sampled": True,
+                    "operation_id": result["operation_id"],
+                    "account": user.account_number,
+                },
+            )
+
+            return JsonResponse(result, status=status.HTTP_200_OK)
+
+        except ValueError as e:
+            logger.warning(
+                f"Transfer failed for user {user.email}: {str(e)}",
+                extra={"account": user.account_number},
+            )
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except TransferConflictError:
+            logger.warning(
+                f"Transfer conflicted for user {user.email}",
+                extra={"account": user.account_number},
+            )
+            return JsonResponse(
+                {"error": "Account is busy. Please retry the transfer."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except Exception as e:
+            logger.error(
+                f"Unexpected error during transfer for user {user.email}: {str(e)}",
+                exc_info=True,
+            )
+            return JsonResponse(
+                {"error": "Transfer failed. Please try again later."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -0,0 +1,106 @@
+import atexit
+import json
+import logging
+import queue
+import random
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None)).keys()
+) | {"message", "asctime", "sampled"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in RESERVED_ATTRS
+        )
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    # Keeps `rate` of the INFO and DEBUG records logged with
+    # extra={"sampled": True}; everything else always passes
+    def __init__(self, rate: float = 1.0) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not getattr(record, "sampled", False):
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class QueueListenerHandler(QueueHandler):
+    # The logging thread only puts records on a bounded queue; a listener
+    # thread formats them and runs the slow handlers. When the queue is full
+    # records are dropped rather than blocking the request. Remaining
+    # records are drained at interpreter exit.
+
+    def __init__(
+        self, handlers: Sequence[logging.Handler], queue_size: int = 10000
+    ) -> None:
+        super().__init__(queue.Queue(queue_size))
+        # Indexing resolves the cfg://handlers.<name> references from LOGGING
+        targets = [handlers[index] for index in range(len(handlers))]
+        # Not `listener`: QueueHandler reserves it for dictConfig's own listener
+        self.queue_listener = QueueListener(
+            self.queue, *targets, respect_handler_level=True
+        )
+        self.dropped = 0
+        self.queue_listener.start()
+        self.listening = True
+        atexit.register(self.close)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Handed over as is: merging the %-style arguments and formatting,
+        # including the traceback, happen in the listener thread, and only
+        # for records the filters kept. Arguments must not change after
+        # logging, which holds for the strings and numbers passed here
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        if self.listening:
+            self.listening = False
+            self.queue_listener.stop()
+        super().close()
+
+
+def dropped_records() -> int:
+    # Records dropped by every queue handler configured in this process
+    loggers = [
+        logging.getLogger(),
+        *(
+            logger
+            for logger in logging.Logger.manager.loggerDict.values()
+            if isinstance(logger, logging.Logger)
+        ),
+    ]
+    handlers = {
+        id(handler): handler
+        for logger in loggers
+        for handler in logger.handlers
+        if isinstance(handler, QueueListenerHandler)
+    }
+    return sum(handler.dropped for handler in handlers.values())
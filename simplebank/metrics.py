@@ -0,0 +1,245 @@
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from threading import Lock
+from typing import Any
+
+from django.db.backends.signals import connection_created
+
+# Metrics live in process memory, so every worker process exposes its own
+# series; Prometheus sums them per instance.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+def _format_labels(labels: Sequence[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._series: dict[tuple[tuple[str, str], ...], float] = {}
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def expose(self) -> list[str]:
+        with self._lock:
+            series = list(self._series.items())
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+            *(
+                f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+                for labels, value in series
+            ),
+        ]
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        # labels -> [per bucket counts, sum, count]
+        self._series: dict[tuple[tuple[str, str], ...], list[Any]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def expose(self) -> list[str]:
+        with self._lock:
+            series = [
+                (labels, list(counts), total, count)
+                for labels, (counts, total, count) in self._series.items()
+            ]
+
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labels, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                bucket_labels = _format_labels([*labels, ("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{self.name}_bucket{_format_labels([*labels, ('le', '+Inf')])} {count}"
+            )
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+REQUESTS = Counter("simplebank_http_requests_total", "HTTP requests handled")
+REQUEST_DURATION = Histogram(
+    "simplebank_http_request_duration_seconds",
+    "Time spent handling a request",
+    LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "simplebank_db_queries_per_request", "Database queries per request", QUERY_BUCKETS
+)
+DB_DURATION = Histogram(
+    "simplebank_db_duration_seconds",
+    "Time per request spent in database queries",
+    LATENCY_BUCKETS,
+)
+LOCK_WAIT = Histogram(
+    "simplebank_lock_wait_seconds",
+    "Time per request spent acquiring row locks",
+    LATENCY_BUCKETS,
+)
+SERIALIZATION = Histogram(
+    "simplebank_serialization_duration_seconds",
+    "Time per request spent serializing and rendering the response",
+    LATENCY_BUCKETS,
+)
+TRANSFER_CONFLICTS = Counter(
+    "simplebank_transfer_conflicts_total",
+    "Optimistic transfer attempts that lost a race on the sender account",
+)
+DB_RETRIES = Counter(
+    "simplebank_db_retries_total",
+    "Transactions retried after a deadlock, serialization failure or lock timeout",
+)
+
+REGISTRY: list[Counter | Histogram] = [
+    REQUESTS,
+    REQUEST_DURATION,
+    DB_QUERIES,
+    DB_DURATION,
+    LOCK_WAIT,
+    SERIALIZATION,
+    TRANSFER_CONFLICTS,
+    DB_RETRIES,
+]
+
+
+class RequestTimings:
+    __slots__ = ("db_queries", "db", "lock_wait", "serialization")
+
+    def __init__(self) -> None:
+        self.db_queries = 0
+        self.db = 0.0
+        self.lock_wait = 0.0
+        self.serialization = 0.0
+
+    def server_timing(self, total: float) -> str:
+        return ", ".join(
+            [
+                f'db;dur={self.db * 1000:.2f};desc="{self.db_queries} queries"',
+                f"lock;dur={self.lock_wait * 1000:.2f}",
+                f"serialize;dur={self.serialization * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            ]
+        )
+
+
+# Context variables follow the request into sync_to_async threads
+_current: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request() -> tuple[RequestTimings, Token]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def finish_request(
+    token: Token,
+    timings: RequestTimings,
+    route: str,
+    method: str,
+    status_code: int,
+    duration: float,
+) -> None:
+    _current.reset(token)
+
+    REQUESTS.inc(route=route, method=method, status=str(status_code))
+    REQUEST_DURATION.observe(duration, route=route, method=method)
+    DB_QUERIES.observe(timings.db_queries, route=route)
+    DB_DURATION.observe(timings.db, route=route)
+    LOCK_WAIT.observe(timings.lock_wait, route=route)
+    SERIALIZATION.observe(timings.serialization, route=route)
+
+
+def record(name: str, seconds: float) -> None:
+    if (timings := _current.get()) is not None:
+        setattr(timings, name, getattr(timings, name) + seconds)
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    # Adds the time spent in the block to the current request, if any
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def _record_query(
+    execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any
+) -> Any:
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_queries += 1
+        timings.db += time.perf_counter() - started
+
+
+def install_query_hook(connection: Any, **kwargs: Any) -> None:
+    # Inserted first: connection.execute_wrapper() pops the last wrapper
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+connection_created.connect(install_query_hook)
+
+
+def expose(samples: Sequence[tuple[str, str, str, float]] = ()) -> str:
+    # `samples` are (name, type, help, value) read at scrape time
+    lines = [line for metric in REGISTRY for line in metric.expose()]
+    for name, kind, documentation, value in samples:
+        lines += [
+            f"# HELP {name} {documentation}",
+            f"# TYPE {name} {kind}",
+            f"{name} {_format_value(value)}",
+        ]
+    return "\n".join(lines) + "\n"
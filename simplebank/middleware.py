@@ -0,0 +1,80 @@
+import time
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+
+from . import metrics
+
+
+class RequestMetricsMiddleware:
+    # Counts queries and database, lock wait and serialization time for each
+    # request, reports them in a Server-Timing header and records them in the
+    # per-route histograms served by /metrics
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Any) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        timings, token = metrics.start_request()
+        # Connections opened before this module was loaded miss the
+        # connection_created hook
+        for connection in connections.all(initialized_only=True):
+            metrics.install_query_hook(connection)
+        # Django turns exceptions into responses before they get here
+        response = self.get_response(request)
+        return self._finish(request, response, timings, token, started)
+
+    async def __acall__(self, request: HttpRequest) -> Any:
+        started = time.perf_counter()
+        timings, token = metrics.start_request()
+        response = await self.get_response(request)
+        return self._finish(request, response, timings, token, started)
+
+    def process_template_response(self, request: HttpRequest, response: Any) -> Any:
+        # DRF responses are rendered right after this hook returns
+        started = time.perf_counter()
+        response.add_post_render_callback(
+            lambda rendered: metrics.record(
+                "serialization", time.perf_counter() - started
+            )
+        )
+        return response
+
+    def _finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        timings: metrics.RequestTimings,
+        token: Any,
+        started: float,
+    ) -> HttpResponseBase:
+        duration = time.perf_counter() - started
+        if settings.SERVER_TIMING_ENABLED:
+            response["Server-Timing"] = timings.server_timing(duration)
+
+        metrics.finish_request(
+            token,
+            timings,
+            self._route(request),
+            request.method or "",
+            response.status_code,
+            duration,
+        )
+        return response
+
+    @staticmethod
+    def _route(request: HttpRequest) -> str:
+        # The URL pattern rather than the path keeps the label set bounded
+        match = getattr(request, "resolver_match", None)
+        return match.route if match is not None else "unmatched"
@@ -1,6 +1,8 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
+from typing import Any
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -19,9 +21,11 @@ INSTALLED_APPS = [
     "drf_spectacular",
     "apps.account",
     "apps.transaction",
+    "apps.outbox",
 ]
 
 MIDDLEWARE = [
+    "simplebank.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -63,6 +67,58 @@ DATABASES = {
     }
 }
 
+# Connection reuse
+# With psycopg 3 and psycopg_pool installed every process keeps a connection
+# pool; with psycopg2 each thread keeps its own connection for DB_CONN_MAX_AGE
+# seconds. Either way connections are health-checked before being reused.
+DB_POOL_ENABLED = (
+    os.getenv("DB_POOL", "true").lower() == "true"
+    and find_spec("psycopg_pool") is not None
+)
+
+
+def database_connection_settings(min_size: int, max_size: int) -> dict[str, Any]:
+    # Each settings module passes its own pool size defaults, env vars win
+    if not DB_POOL_ENABLED:
+        return {
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+        }
+
+    return {
+        # Django's pool replaces persistent connections
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", min_size)),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", max_size)),
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            }
+        },
+    }
+
+
+DATABASES["default"].update(database_connection_settings(min_size=2, max_size=10))
+
+# Cache
+# The default local-memory cache is per process; deployments running several
+# workers need a shared backend, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# Worker processes serving requests, uvicorn and gunicorn read the same
+# variable. Balances are not cached in a per-process cache with more than one.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "simplebank"),
+    }
+}
+# Seconds a cached balance may be served before it is re-read
+BALANCE_CACHE_TIMEOUT = int(os.getenv("BALANCE_CACHE_TIMEOUT", "60"))
+
 # Custom User Model
 AUTH_USER_MODEL = "account.User"
 
@@ -90,7 +146,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # DRF settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.account.authentication.AccountJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -111,7 +167,44 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": False,
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "apps.account.serializers.AccountTokenObtainPairSerializer"
+    ),
 }
+# Seconds a user's active flag is cached by AccountJWTAuthentication,
+# 0 checks the database on every request
+JWT_ACTIVE_CHECK_TTL = int(os.getenv("JWT_ACTIVE_CHECK_TTL", "30"))
+# Seconds between batched last_login writes, 0 writes during the login request
+LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", "5"))
+
+# Per-request db/lock/serialize timings in a Server-Timing response header
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+# Bearer token the scraper sends to /metrics, the endpoint is closed when empty
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Transfers
+# "direct" credits fees to the system account inside every transfer,
+# "buckets" spreads them over striped fee buckets rolled up by `rollup_fees`.
+TRANSFER_FEE_MODE = os.getenv("TRANSFER_FEE_MODE", "direct")
+TRANSFER_FEE_BUCKETS = int(os.getenv("TRANSFER_FEE_BUCKETS", "16"))
+# "pessimistic" locks both accounts with SELECT ... FOR UPDATE for the whole
+# transfer, "optimistic" reads them without locks and debits the sender only
+# if its version is unchanged, retrying conflicts up to N times with the
+# same backoff as below.
+TRANSFER_CONCURRENCY_MODE = os.getenv("TRANSFER_CONCURRENCY_MODE", "pessimistic")
+TRANSFER_OPTIMISTIC_RETRIES = int(os.getenv("TRANSFER_OPTIMISTIC_RETRIES", "3"))
+# Transfers aborted by a deadlock, serialization failure or lock timeout are
+# retried up to N times, sleeping a random 0..BACKOFF * 2^attempt seconds first
+TRANSFER_RETRY_ATTEMPTS = int(os.getenv("TRANSFER_RETRY_ATTEMPTS", "3"))
+TRANSFER_RETRY_BACKOFF = float(os.getenv("TRANSFER_RETRY_BACKOFF", "0.05"))
+# How long a client transaction_id replays the stored transfer response
+IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24")))
+
+# Outbox
+# Where `relay_outbox` publishes events: "stdout", "file" or a dotted path
+# to an apps.outbox.sinks.Sink subclass
+OUTBOX_SINK = os.getenv("OUTBOX_SINK", "stdout")
+OUTBOX_FILE_PATH = os.getenv("OUTBOX_FILE_PATH", "outbox.ndjson")
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "SimpleBank API",
@@ -120,6 +213,12 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# Logging
+# Loggers only enqueue records, a listener thread formats and writes them.
+# Info lines logged with extra={"sampled": True} are kept at LOG_SAMPLE_RATE.
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -132,6 +231,15 @@ LOGGING = {
             "format": "{levelname} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "simplebank.log.JsonFormatter",
+        },
+    },
+    "filters": {
+        "sampling": {
+            "()": "simplebank.log.SamplingFilter",
+            "rate": LOG_SAMPLE_RATE,
+        },
     },
     "handlers": {
         "console": {
@@ -141,16 +249,24 @@ LOGGING = {
         "file": {
             "class": "logging.FileHandler",
             "filename": "app.log",
-            "formatter": "verbose",
+            "formatter": "json",
+        },
+        # Handlers are configured in name order, "queue" has to sort after
+        # the handlers it references
+        "queue": {
+            "()": "simplebank.log.QueueListenerHandler",
+            "handlers": ["cfg://handlers.console", "cfg://handlers.file"],
+            "queue_size": LOG_QUEUE_SIZE,
+            "filters": ["sampling"],
         },
     },
     "loggers": {
         "django": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": "INFO",
         },
         "apps": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": "DEBUG",
         },
     },
@@ -1,5 +1,12 @@
+import os
+
 from .base import *
 
 DEBUG = True
 
 ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
+
+# Write last_login immediately so it is visible right after logging in
+LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", "0"))
+
+DATABASES["default"].update(database_connection_settings(min_size=1, max_size=4))
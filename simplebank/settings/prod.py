@@ -5,3 +5,5 @@ from .base import *
 DEBUG = False
 
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "").split(",")
+
+DATABASES["default"].update(database_connection_settings(min_size=4, max_size=20))
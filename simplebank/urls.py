@@ -3,6 +3,8 @@ from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from apps.account.views import MetricsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     # auth
@@ -10,6 +12,8 @@ urlpatterns = [
     path("api/auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     # transaction
     path("api/transactions/", include("apps.transaction.urls")),
+    # Prometheus
+    path("metrics", MetricsView.as_view(), name="metrics"),
     # Swagger UI
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(